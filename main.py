@@ -3,10 +3,13 @@ import traceback
 
 # Import the game function from our refactored module
 from src.game import run_game
+from src.audio import ensure_asset_dirs
 
 # Entry point for the application
 if __name__ == '__main__':
     try:
+        # Create any missing sound folders once, outside the sound loading path
+        ensure_asset_dirs()
         # Run the game loop
         run_game()
     except Exception as e:
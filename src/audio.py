@@ -3,36 +3,92 @@ import os
 import random
 from src.config import *
 import time
+import threading
 import numpy as np
 import math
+import re
+from collections import deque
+
+# Filename patterns used to guess the tempo of ambient tracks
+_BPM_RE = re.compile(r'(\d+)bpm|bpm[_\s]?(\d+)', re.IGNORECASE)
+_WORD_RE = re.compile(r'[a-z]+')
+_SLOW_TERMS = frozenset(('slow', 'ambient', 'chill'))
+_MEDIUM_TERMS = frozenset(('medium', 'moderate'))
+_FAST_TERMS = frozenset(('fast', 'upbeat', 'energetic'))
+
+# One full sine period sampled for the per-frame beat intensity; a phase in radians
+# maps to an index with int(phase * _SIN_LUT_SCALE) & _SIN_LUT_MASK
+_SIN_LUT_SIZE = 256
+_SIN_LUT_MASK = _SIN_LUT_SIZE - 1
+_SIN_LUT_SCALE = _SIN_LUT_SIZE / (2 * math.pi)
+_SIN_LUT = np.sin(np.linspace(0, 2 * math.pi, _SIN_LUT_SIZE, endpoint=False)).astype(np.float32).tolist()
+
+# Smallest master volume change worth sending to the mixer (8-bit effective volume)
+_VOLUME_EPSILON = 1.0 / 256
+
+# numpy sample type for each pygame.mixer.get_init() sample size
+_MIXER_DTYPES = {8: np.uint8, -8: np.int8, 16: np.uint16, -16: np.int16, 32: np.float32}
+
+def ensure_asset_dirs():
+    """Create the sound folders listed in config if they don't exist yet"""
+    for _, folder_path in SOUND_FOLDERS_ITEMS:
+        os.makedirs(folder_path, exist_ok=True)
+
 
 class AudioManager:
     """Manages loading and playing sounds with spatial audio support"""
     
+    # Monotonic clock bound once; time.time() can jump backwards and stall the cooldowns
+    _now_ns_clock = staticmethod(time.perf_counter_ns) # Same clock the game loop ticks us with
+    
     def __init__(self):
         self.sound_categories = {}  # Dictionary of sound categories, each containing a list of sounds
+        self._pcm = {}  # Decoded PCM arrays backing each loaded sound, per category
+        self._sound_files = {}  # Sound file paths per category, found at initialize()
         self.sound_enabled = SOUND_ENABLED
         self.initialized = False
-        self.last_played = {}  # Track when sounds were last played
+        self._cat_idx = {}  # Category name -> index into the cooldown arrays below
+        self._cd = np.zeros(0, dtype=np.int64)  # Per-category cooldown (ns)
+        self._last = np.zeros(0, dtype=np.int64)  # Per-category last play time (ns)
         self.sound_cooldowns = {
             'collision': 0.05,  # Minimum time between collision sounds
             'ambient': 0.0     # No cooldown for ambient
         }
         self.global_cooldown = 0.01  # Global minimum between any sounds
         self.last_any_sound = 0
+        
+        # Global cooldown pre-converted to integer nanoseconds for the play() hot path
+        self._global_cooldown_ns = int(self.global_cooldown * 1e9)
+        self._now_ns = self._now_ns_clock()  # Frame timestamp, refreshed once per tick
         self.ambient_playing = None  # Currently playing ambient sound
+        self._last_ambient_vol = None  # Ambient sound the master volume was last applied to
+        self._sfx_channels = deque()  # Ring of channels used for sound effects
+        self._priority_channels = []  # Channels reserved for important sounds
+        self._all_channels = []
+        self.stats = {'active_channels': 0, 'peak_active_channels': 0}
+        self._next_stats_ns = 0  # Channel concurrency is sampled at 10 Hz from update()
+        
+        # Bounded queue of (category, volume_modifier, pan_bin) consumed by the audio worker;
+        # deque append/popleft are atomic, so no lock is needed between the two threads
+        self._play_queue = deque(maxlen=256)
+        self._worker_thread = None
+        self._worker_running = False
         
         # Audio analysis and rhythm detection
         self.last_beat_time = 0
         self.beat_interval = 0.5  # Default beat interval (seconds)
         self.beat_energy_threshold = 0.3
-        self.energy_history = []
         self.energy_window_size = 10
+        # Preallocated fixed-size ring for recent energy samples, in place of a growing list
+        self._energy_ring = np.zeros(self.energy_window_size, dtype=np.float32)
+        self._ring_idx = 0
         self.beat_detected = False
         self.last_energy = 0
         self.smoothed_energy = 0
         self.beat_count = 0
         self.beat_phase = 0
+        self._update_interval_ns = int(1e9 / 60)  # Run beat detection at most at 60 Hz
+        self._next_update_ns = 0
         
         # Rhythm pattern detection
         self.beat_times = []
@@ -40,91 +96,157 @@ class AudioManager:
         self.rhythm_detected = False
         self.estimated_bpm = 120  # Default BPM
         self.current_master_volume = 1.0
+        
+        # Config values used on every play() bound once
+        self._master_vol = SOUND_VOLUME_MASTER
+        self._pan_scale = INV_HALF_W * (PAN_BINS // 2)  # Screen x -> pan bin in a single multiply
+        self._half_w = SCREEN_WIDTH * 0.5
+        self._center_dx_sq = (self._half_w / 128) ** 2
+        
+        # Per-bin (left, right) gains for pan positions spread evenly across [-1, 1]
+        self._pan_lut = [(1.0 - pan, 1.0 + pan) for pan in np.linspace(-1.0, 1.0, PAN_BINS + 1).tolist()]
     
     def initialize(self):
-        """Initialize the audio system"""
+        """Initialize the audio system; the mixer is only started if there are sounds to play"""
         if not self.sound_enabled:
             return
+        
+        # Find the sound files up front so we know whether the mixer will ever be needed
+        self._sound_files = self._find_sound_files()
+        if not any(self._sound_files.values()):
+            return
+        
+        # Start the mixer and decode every sound now, before the intro, rather than on the first collision
+        if not self._ensure_mixer():
+            return
+        
+        # Start ambient sound if available
+        if self._sound_files.get('ambient'):
+            self._play_ambient()
+    
+    def _ensure_mixer(self):
+        """Start the mixer, load sounds and start the audio worker on first use (idempotent)"""
+        if self.initialized:
+            return True
+        if not self.sound_enabled:
+            return False
             
         try:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
-            pygame.mixer.set_num_channels(16)  # Reduced number of channels to prevent audio issues
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=MIXER_BUFFER)
+            pygame.mixer.set_num_channels(MAX_ACTIVE_CHANNELS)  # Sized to the concurrency we actually see
+            # Rotate through a fixed ring of effect channels instead of scanning for a free one;
+            # the last two channels are kept back for important sounds
+            self._all_channels = [pygame.mixer.Channel(i) for i in range(MAX_ACTIVE_CHANNELS)]
+            self._sfx_channels = deque(self._all_channels[:-2])
+            self._priority_channels = self._all_channels[-2:]
             print("Pygame mixer initialized.")
             self.initialized = True
         except pygame.error as e:
             print(f"Error initializing pygame mixer: {e}")
             self.sound_enabled = False
-            return
+            return False
             
         # Load all sounds defined in config
         self._load_sounds()
         
-        # Start ambient sound if available
-        self._play_ambient()
+        # Start the worker that performs the actual mixer calls for play()
+        self._worker_running = True
+        self._worker_thread = threading.Thread(target=self._audio_worker, daemon=True)
+        self._worker_thread.start()
+        return True
     
-    def _load_sounds(self):
-        """Load all sound files from folders"""
-        for category, folder_path in SOUND_FOLDERS.items():
-            self.sound_categories[category] = []
-            self.last_played[category] = 0  # Initialize last played time
-            
-            # Create folder if it doesn't exist
-            os.makedirs(folder_path, exist_ok=True)
+    def _find_sound_files(self):
+        """Collect the sound file paths for every category defined in config"""
+        sound_extensions = ('.ogg', '.wav', '.mp3')
+        # Scan the working directory at most once for the fallback lookups below
+        cwd_files = None
+        sound_files_by_category = {}
+        for category, folder_path in SOUND_FOLDERS_ITEMS:
+            sound_files_by_category[category] = []
             
             # Check if the folder exists and contains files
-            if os.path.exists(folder_path) and os.path.isdir(folder_path):
-                sound_files = [f for f in os.listdir(folder_path) 
-                              if f.endswith(('.ogg', '.wav', '.mp3')) and os.path.isfile(os.path.join(folder_path, f))]
+            if os.path.isdir(folder_path):
+                # scandir reports the entry type, so no extra stat per file
+                with os.scandir(folder_path) as entries:
+                    sound_files = [entry.name for entry in entries
+                                  if entry.name.endswith(sound_extensions) and entry.is_file()]
                 
                 # Fallback to current directory with naming pattern if folder is empty
                 if not sound_files:
-                    fallback_files = [f for f in os.listdir('.') 
-                                     if f.startswith(category) and f.endswith(('.ogg', '.wav', '.mp3'))]
+                    if cwd_files is None:
+                        cwd_files = os.listdir('.')
+                    fallback_files = [f for f in cwd_files 
+                                     if f.startswith(category) and f.endswith(sound_extensions)]
                     if fallback_files:
                         print(f"No files found in {folder_path}, using fallback files: {fallback_files}")
-                        for filename in fallback_files:
-                            try:
-                                sound = pygame.mixer.Sound(filename)
-                                sound.set_volume(SOUND_VOLUME_MASTER)
-                                self.sound_categories[category].append(sound)
-                                print(f"Loaded sound for {category}: {filename}")
-                            except pygame.error as e:
-                                print(f"Error loading sound '{filename}': {e}")
+                        sound_files_by_category[category] = fallback_files
                 else:
-                    for filename in sound_files:
-                        full_path = os.path.join(folder_path, filename)
-                        try:
-                            sound = pygame.mixer.Sound(full_path)
-                            sound.set_volume(SOUND_VOLUME_MASTER)
-                            self.sound_categories[category].append(sound)
-                            print(f"Loaded sound for {category}: {full_path}")
-                        except pygame.error as e:
-                            print(f"Error loading sound '{full_path}': {e}")
+                    sound_files_by_category[category] = [os.path.join(folder_path, f) for f in sound_files]
             else:
                 # Handle case where the specified folder doesn't exist
-                fallback_files = [f for f in os.listdir('.') 
-                                 if f.startswith(category) and f.endswith(('.ogg', '.wav', '.mp3'))]
+                if cwd_files is None:
+                    cwd_files = os.listdir('.')
+                fallback_files = [f for f in cwd_files 
+                                 if f.startswith(category) and f.endswith(sound_extensions)]
                 if fallback_files:
                     print(f"Folder {folder_path} not found, using fallback files: {fallback_files}")
-                    for filename in fallback_files:
-                        try:
-                            sound = pygame.mixer.Sound(filename)
-                            sound.set_volume(SOUND_VOLUME_MASTER)
-                            self.sound_categories[category].append(sound)
-                            print(f"Loaded sound for {category}: {filename}")
-                        except pygame.error as e:
-                            print(f"Error loading sound '{filename}': {e}")
+                    sound_files_by_category[category] = fallback_files
                 else:
                     print(f"Warning: No sounds found for category '{category}'")
+        return sound_files_by_category
+    
+    def _load_sounds(self):
+        """Load all sound files found by _find_sound_files"""
+        # Index categories so play() can check cooldowns with plain array lookups
+        self._cat_idx = {name: i for i, (name, _) in enumerate(SOUND_FOLDERS_ITEMS)}
+        self._cd = np.array([int(self.sound_cooldowns.get(name, 0.1) * 1e9)  # Default 0.1s cooldown
+                             for name, _ in SOUND_FOLDERS_ITEMS], dtype=np.int64)
+        self._last = np.zeros(len(self._cat_idx), dtype=np.int64)
+        
+        for category, _ in SOUND_FOLDERS_ITEMS:
+            self.sound_categories[category] = []
+            self._pcm[category] = []
+            for path in self._sound_files.get(category, []):
+                self._load_sound(category, path)
+    
+    def _load_sound(self, category, path):
+        """Load a sound file and keep it resident as pre-decoded int16 PCM"""
+        try:
+            sound = pygame.mixer.Sound(path)
+            # Decode once up front and rebuild the Sound from the contiguous buffer,
+            # so the first play() never pays a decode cost
+            pcm = self._to_mixer_format(pygame.sndarray.array(sound))
+            sound = pygame.sndarray.make_sound(pcm)
+            sound.set_volume(SOUND_VOLUME_MASTER)
+            self._pcm[category].append(pcm)
+            self.sound_categories[category].append(sound)
+            print(f"Loaded sound for {category}: {path}")
+        except pygame.error as e:
+            print(f"Error loading sound '{path}': {e}")
+    
+    def _to_mixer_format(self, pcm):
+        """Convert decoded samples to the mixer's native sample type and channel layout"""
+        # SDL_mixer already resamples to the mixer frequency when a file is loaded,
+        # so only the sample type and channel count can still differ here
+        _, size, channels = pygame.mixer.get_init()
+        dtype = _MIXER_DTYPES.get(size, np.int16)
+        if pcm.ndim == 1 and channels > 1:
+            pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+        elif pcm.ndim == 2 and pcm.shape[1] != channels:
+            pcm = pcm.mean(axis=1) if channels == 1 else np.repeat(pcm[:, :1], channels, axis=1)
+        return np.ascontiguousarray(pcm, dtype=dtype)
     
     def _play_ambient(self):
         """Start playing ambient sounds if available"""
+        if not self._ensure_mixer():
+            return
         ambient_sounds = self.sound_categories.get('ambient', [])
         if ambient_sounds:
             # Select a random ambient sound to play
             sound = random.choice(ambient_sounds)
             sound.set_volume(SOUND_VOLUME_AMBIENT)
-            sound.play(loops=-1)
+            # Give the looping ambient track its own channel so it never blocks the effect ring
+            self._sfx_channels.pop().play(sound, loops=-1)
             self.ambient_playing = sound
             print(f"Playing ambient sound")
             
@@ -144,8 +266,7 @@ class AudioManager:
                 return
             
             # Look for BPM pattern in filename (e.g. "120bpm" or "bpm_120")
-            import re
-            bpm_match = re.search(r'(\d+)bpm|bpm[_\s]?(\d+)', filename.lower())
+            bpm_match = _BPM_RE.search(filename)
             
             if bpm_match:
                 groups = bpm_match.groups()
@@ -156,12 +277,13 @@ class AudioManager:
                     print(f"Detected BPM {bpm} from filename")
                     self.rhythm_detected = True
             else:
-                # Default values for different music types based on the filename
-                if any(term in filename.lower() for term in ['slow', 'ambient', 'chill']):
+                # Default values for different music types based on the words in the filename
+                tokens = set(_WORD_RE.findall(filename.lower()))
+                if tokens & _SLOW_TERMS:
                     self.estimated_bpm = 80
-                elif any(term in filename.lower() for term in ['medium', 'moderate']):
+                elif tokens & _MEDIUM_TERMS:
                     self.estimated_bpm = 110
-                elif any(term in filename.lower() for term in ['fast', 'upbeat', 'energetic']):
+                elif tokens & _FAST_TERMS:
                     self.estimated_bpm = 140
                 else:
                     # Use simulated rhythms for songs without BPM indication
@@ -174,14 +296,37 @@ class AudioManager:
             self.estimated_bpm = 120  # Fallback
             self.beat_interval = 60.0 / self.estimated_bpm
     
+    def tick(self, now_ns):
+        """Cache the frame timestamp (the game loop's time.perf_counter(), in ns) used by update() and play()"""
+        self._now_ns = now_ns
+    
     def update(self):
         """Update audio analysis and beat detection"""
-        if not self.sound_enabled or not self.initialized or not self.ambient_playing:
+        if not self.sound_enabled or not self.initialized:
             return False
         
+        # Track concurrency so MAX_ACTIVE_CHANNELS can be tuned to the observed worst case;
+        # sampled periodically rather than scanning every channel after each play
+        now_ns = self._now_ns
+        if now_ns >= self._next_stats_ns:
+            self._next_stats_ns = now_ns + 100_000_000
+            active = sum(1 for c in self._all_channels if c.get_busy())
+            self.stats['active_channels'] = active
+            self.stats['peak_active_channels'] = max(self.stats['peak_active_channels'], active)
+        
+        if not self.ambient_playing:
+            return False
+        
+        # Beats are half a second apart, so detection only needs to run at ~60 Hz even if
+        # the loop runs faster; a skipped call never reports a new beat
+        if now_ns < self._next_update_ns:
+            return False
+        self._next_update_ns = max(self._next_update_ns + self._update_interval_ns,
+                                   now_ns - self._update_interval_ns)
+        
         # Since we can't directly access audio data in pygame without FFT analysis,
         # we'll use a time-based approach to simulate beat detection
-        current_time = time.time()
+        current_time = now_ns * 1e-9
         
         # Simple beat simulation based on estimated rhythm
         if self.rhythm_detected:
@@ -192,6 +337,7 @@ class AudioManager:
             
             # We consider a beat when we're at the start of the phase (0 to 0.1)
             beat_detected = beat_phase < 0.1 and (current_time - self.last_beat_time) > self.beat_interval * 0.5
+            self.beat_detected = beat_detected
             
             if beat_detected:
                 self.last_beat_time = current_time
@@ -202,6 +348,7 @@ class AudioManager:
             # This creates a predictable rhythm for visuals to sync with
             elapsed = current_time % self.beat_interval
             beat_detected = elapsed < 0.1 and (current_time - self.last_beat_time) > self.beat_interval * 0.5
+            self.beat_detected = beat_detected
             
             if beat_detected:
                 self.last_beat_time = current_time
@@ -212,16 +359,17 @@ class AudioManager:
     
     def get_beat_intensity(self):
         """Get the current beat intensity (0.0 to 1.0)"""
-        # Calculate a sine wave based on the beat phase
-        if not self.sound_enabled or not self.initialized:
+        # Calculate a sine wave based on the beat phase; runs off the frame clock, so it
+        # pulses whether or not the mixer was started
+        if not self.sound_enabled:
             return 0.5  # Default middle value
         
         # Use both the beat phase and a secondary pulse for more variety
-        current_time = time.time()
-        beat_intensity = abs(math.sin(math.pi * self.beat_phase))
+        current_time = self._now_ns * 1e-9 # Frame timestamp from tick(), no clock read per call
+        beat_intensity = abs(_SIN_LUT[int(self.beat_phase * (_SIN_LUT_SIZE // 2)) & _SIN_LUT_MASK])
         
         # Add a secondary slower pulse for variety
-        secondary_pulse = abs(math.sin(current_time * 0.5))
+        secondary_pulse = abs(_SIN_LUT[int(current_time * 0.5 * _SIN_LUT_SCALE) & _SIN_LUT_MASK])
         
         # Combine both pulses with the beat phase being dominant
         combined_intensity = beat_intensity * 0.7 + secondary_pulse * 0.3
@@ -249,9 +397,16 @@ class AudioManager:
         # Clamp volume between 0 and 1
         volume = max(0.0, min(1.0, volume))
         
+        # Skip changes the mixer can't represent anyway, unless the ambient track changed
+        # or we're landing exactly on silence/full volume
+        if (abs(volume - self.current_master_volume) < _VOLUME_EPSILON and 0.0 < volume < 1.0
+                and self._last_ambient_vol is self.ambient_playing):
+            return
+        
         # Update ambient sound volume if playing
         if self.ambient_playing:
             self.ambient_playing.set_volume(SOUND_VOLUME_AMBIENT * volume)
+        self._last_ambient_vol = self.ambient_playing
             
         # Update the base volume for future sound effects
         self.current_master_volume = volume
@@ -265,47 +420,69 @@ class AudioManager:
             volume_modifier: Volume multiplier (0.0-1.0)
             position: Optional Vector2 position for spatial audio
         """
-        if not self.sound_enabled or category not in self.sound_categories or not self.sound_categories[category]:
+        # Bring the mixer up on the first sound that actually has files to play
+        if not self.initialized and (not self._sound_files.get(category) or not self._ensure_mixer()):
+            return
+        cat = self._cat_idx.get(category)
+        if not self.sound_enabled or not self._worker_running or cat is None or not self.sound_categories[category]:
             return
             
-        # Check sound-specific cooldown
-        current_time = time.time()
-        cooldown = self.sound_cooldowns.get(category, 0.1)  # Default 0.1s cooldown
-        
         # Skip if this sound category is on cooldown or global cooldown is active
-        if (current_time - self.last_played.get(category, 0) < cooldown or
-            current_time - self.last_any_sound < self.global_cooldown):
+        current_time = self._now_ns
+        if (current_time - self._last[cat] < self._cd[cat] or
+            current_time - self.last_any_sound < self._global_cooldown_ns):
             return
             
         # Update last played time
-        self.last_played[category] = current_time
+        self._last[cat] = current_time
         self.last_any_sound = current_time
 
+        # Quantize x position into one of PAN_BINS + 1 bins (0 left, PAN_BINS right);
+        # sounds within 1/128 of the center stay on the plain mono volume path
+        pan_bin = None
+        if position:
+            dx = position.x - self._half_w
+            if dx * dx >= self._center_dx_sq:
+                pan_bin = int(position.x * self._pan_scale)
+                pan_bin = max(0, min(PAN_BINS, pan_bin))
+
+        # Hand the actual mixer calls to the audio worker thread
+        self._play_queue.append((category, volume_modifier, pan_bin))
+    
+    def _audio_worker(self):
+        """Drain queued play requests off the game thread"""
+        while self._worker_running:
+            try:
+                category, volume_modifier, pan_bin = self._play_queue.popleft()
+            except IndexError:
+                time.sleep(0.001)
+                continue
+            self._play_now(category, volume_modifier, pan_bin)
+    
+    def _play_now(self, category, volume_modifier, pan_bin):
+        """Start a queued sound on the next free effect channel (runs on the audio worker)"""
         try:
-            channel = pygame.mixer.find_channel(False)  # Try to find available channel without forcing
-            if channel is None:
-                # If no free channels, only force for important sounds
+            # Take the next channel in the ring and only check that one
+            channel = self._sfx_channels[0]
+            self._sfx_channels.rotate(-1)
+            if channel.get_busy():
+                # If the channel is still playing, only important sounds get a priority channel
                 if category in ['start', 'end']:
-                    channel = pygame.mixer.find_channel(True)  # Force only for important sounds
+                    channel = next((c for c in self._priority_channels if not c.get_busy()),
+                                   self._priority_channels[0])
                 else:
-                    return  # Skip sound if no channels available
+                    return  # Skip sound if the next channel is still busy
             
             # Select a random sound from the category
             sound = random.choice(self.sound_categories[category])
-            base_volume = SOUND_VOLUME_MASTER * volume_modifier * (getattr(self, 'current_master_volume', 1.0))
+            base_volume = self._master_vol * volume_modifier * self.current_master_volume
 
             # --- Simple Panning based on position ---
-            if position:
-                # Map x position (-1 left, 1 right)
-                pan = (position.x - SCREEN_WIDTH / 2) / (SCREEN_WIDTH / 2)
-                pan = max(-1.0, min(1.0, pan))
+            if pan_bin is not None:
                 # Pygame panning: set_volume(left_vol, right_vol)
-                left_vol = base_volume * (1.0 - pan) / 2.0 * 2  # Multiply by 2 to maintain overall volume
-                right_vol = base_volume * (1.0 + pan) / 2.0 * 2
+                left_gain, right_gain = self._pan_lut[pan_bin]
                 # Ensure volumes don't exceed 1.0 after potential modifiers
-                left_vol = min(1.0, left_vol)
-                right_vol = min(1.0, right_vol)
-                channel.set_volume(left_vol, right_vol)
+                channel.set_volume(min(1.0, base_volume * left_gain), min(1.0, base_volume * right_gain))
             else:
                 channel.set_volume(base_volume)
 
@@ -319,6 +496,12 @@ class AudioManager:
     
     def cleanup(self):
         """Clean up audio resources"""
+        # Stop the worker before tearing down the mixer it talks to
+        self._worker_running = False
+        if self._worker_thread:
+            self._worker_thread.join(timeout=1.0)
+            self._worker_thread = None
+        self._play_queue.clear()
         if self.sound_enabled and pygame.mixer.get_init():
             pygame.mixer.stop()
             pygame.mixer.quit()
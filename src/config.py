@@ -5,7 +5,9 @@ SCREEN_WIDTH = 900
 SCREEN_HEIGHT = 900
 FPS = 60
 CENTER = pygame.Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+CENTER_X, CENTER_Y = float(CENTER.x), float(CENTER.y)  # Plain floats for scalar hot paths
 CONTAINER_RADIUS = 400
+INV_HALF_W = 2.0 / SCREEN_WIDTH   # Maps screen x to [0, 2] for stereo panning
 
 # --- Physics (Values represent the state at the START of the simulation) ---
 INITIAL_GRAVITY_STRENGTH = 500.0  # Starting gravity
@@ -90,14 +92,33 @@ INITIAL_SPAWN_RATE = 0.001        # Chance per frame to spawn a ball at start
 FINAL_SPAWN_RATE = 0.004          # Chance per frame to spawn a ball at 60 seconds
 BALLS_CAN_DIE = False
 
+# --- Recording ---
+VIDEO_QUEUE_SIZE = 4              # Frames buffered between the game loop and the video writer thread
+VIDEO_MAX_WAIT = None             # Seconds capture may wait for a free frame buffer before dropping the frame (None never drops)
+VIDEO_SCALE = 1.0                 # Recorded frame size relative to the window (0.5 = half width and height)
+VIDEO_FPS = FPS                   # Recorded frame rate; below FPS, game frames are skipped evenly
+# Encoder arguments for the ffmpeg pipe writer, preferred over OpenCV's software mp4v when ffmpeg is installed
+VIDEO_FFMPEG_CODEC = ('-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18', '-pix_fmt', 'yuv420p')
+VIDEO_LOSSLESS = False            # Pipe raw frames to an ffmpeg FFV1 encoder, transcoding to MP4 after the run
+# GStreamer hardware H.264 encoders tried in order before falling back to software mp4v
+VIDEO_HW_ENCODERS = (
+    'nvh264enc preset=low-latency bitrate=12000',
+    'vaapih264enc bitrate=12000',
+)
+
 # --- Sound ---
 SOUND_ENABLED = True
 SOUND_VOLUME_MASTER = 1.5
 SOUND_VOLUME_AMBIENT = 0.2
+PAN_BINS = 64                     # Stereo pan resolution used by the audio pan lookup table
+MAX_ACTIVE_CHANNELS = 8           # Mixer channels (2 reserved for important sounds, 1 for ambient)
+MIXER_BUFFER = 1024               # Mixer buffer in samples (~23ms at 44.1kHz), raise to 2048 on underruns
 # Define sound categories as folders instead of specific files
 SOUND_FOLDERS = {
     'collision': 'sounds/collision',
     'ambient': 'sounds/ambient',
     # 'start': 'sounds/start',
     # 'end': 'sounds/end'
-}
\ No newline at end of file
+}
+# Frozen (category, folder) pairs so loading iterates a tuple instead of a live dict
+SOUND_FOLDERS_ITEMS = tuple(SOUND_FOLDERS.items())
@@ -1,30 +1,83 @@
 import pygame
 import random
 import math
-import time
+import collections
+import numpy as np
+from functools import lru_cache
 from src.config import *
-from src.utilities import lerp_color, spawn_particles
+from src.utilities import hsv_to_rgb_array, lerp_color, spawn_particles, get_glow_sprite, get_haze_sprite, get_disc_sprite
 from src.audio import audio_manager
 from src.game_state import game_state
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 1024-entry sine lookup table for the per-ball pulse/oscillation phases
+_SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, 1024, endpoint=False)).astype(np.float32).tolist()
+_SIN_LUT_SCALE = 1024 / (2 * math.pi)
+
+def fsin(x):
+    """Table sine, accurate to ~0.006 which is plenty for visual pulsing"""
+    return _SIN_LUT[int(x * _SIN_LUT_SCALE) & 1023]
+
+# Trail alpha and radius-factor tables indexed by [points_in_trail][age], newest point first
+_TRAIL_ALPHAS = [
+    np.array([int(TRAIL_ALPHA_START * ((n - 1 - i) / n)) for i in range(n)], dtype=np.uint8).tolist()
+    for n in range(1, TRAIL_LENGTH + 1)
+]
+_TRAIL_ALPHAS.insert(0, [])
+_TRAIL_RADIUS_FACTORS = [(np.arange(n, 0, -1) / (n + 1)).tolist() for n in range(TRAIL_LENGTH + 1)]
+
+def _build_ball_color_lut():
+    """
+    RGB for every whole hue and 11 pulse steps of the ball color cycle
+    (saturation 80-100, value 85-100), as nested lists of (r, g, b) tuples
+    """
+    pulse = np.linspace(0.0, 1.0, 11)[None, :]
+    rgb = hsv_to_rgb_array(np.arange(360)[:, None], 80 + pulse * 20, 85 + pulse * 15)
+    return [[tuple(c) for c in row] for row in rgb.tolist()]
+
+_BALL_COLOR_LUT = _build_ball_color_lut() # [int hue][pulse bucket] -> (r, g, b)
+
+@lru_cache(maxsize=2048)
+def _trail_sprites(n, radius_q, rgb):
+    """
+    Resolve a whole trail's sprites at once: (sprite, radius) per point, newest first,
+    cut at the first point too faint to draw. radius_q is the ball radius in quarter pixels.
+    """
+    radius = radius_q * 0.25
+    sprites = []
+    for alpha, factor in zip(_TRAIL_ALPHAS[n], _TRAIL_RADIUS_FACTORS[n]):
+        if alpha <= 5:
+            break # Alphas only fall with age
+        trail_radius = max(1, int(radius * factor))
+        sprites.append((get_glow_sprite(trail_radius, rgb, alpha), trail_radius))
+    return tuple(sprites)
+
 class Effect:
     """Visual effect class (flashes, shockwaves, etc.)"""
 
+    __slots__ = ('position', 'color', 'rgb', 'start_radius', 'end_radius', 'duration', 'start_time', 'effect_type')
+
     def __init__(self, position, color, start_radius, end_radius, duration, effect_type="flash"):
         self.position = pygame.Vector2(position)
         self.color = color
+        self.rgb = tuple(color[:3])
         self.start_radius = start_radius
         self.end_radius = end_radius
         self.duration = duration
-        self.start_time = time.time()
+        self.start_time = game_state.frame_time
         self.effect_type = effect_type
 
-    def update(self):
-        return (time.time() - self.start_time) < self.duration
+    def update(self, now):
+        return (now - self.start_time) < self.duration
 
-    def draw(self, surface, offset):
-        elapsed = time.time() - self.start_time
-        progress = min(1.0, elapsed / self.duration)
+    def draw(self, queue, now, offset):
+        elapsed = now - self.start_time
+        progress = max(0.0, min(1.0, elapsed / self.duration)) # Effects spawned this frame start after now
 
         if self.effect_type == "flash":
             current_radius = self.start_radius + (self.end_radius - self.start_radius) * progress
@@ -34,68 +87,32 @@ class Effect:
             int_radius = max(1, int(current_radius))
 
             try:
-                flash_surf = pygame.Surface((int_radius * 2, int_radius * 2), pygame.SRCALPHA)
+                flash_surf = get_glow_sprite(int_radius, self.rgb, current_alpha)
             except (pygame.error, ValueError):
                 return
 
-            flash_color = self.color[:3] + (current_alpha,)
-            pygame.draw.circle(flash_surf, flash_color, (int_radius, int_radius), int_radius)
-            surface.blit(flash_surf,
-                        (self.position.x - int_radius + offset.x, self.position.y - int_radius + offset.y),
-                        special_flags=pygame.BLEND_RGBA_ADD)
-
-
-class Particle:
-    """Simple particle that moves and fades over time"""
-
-    def __init__(self, position, velocity, color, lifespan, radius):
-        self.position = pygame.Vector2(position)
-        self.velocity = pygame.Vector2(velocity)
-        self.color = color
-        self.lifespan = lifespan
-        self.start_time = time.time()
-        self.radius = max(1, radius)
-
-    def update(self, dt):
-        self.position += self.velocity * dt
-        self.velocity *= 0.98 # Slight drag
-        return (time.time() - self.start_time) < self.lifespan
-
-    def draw(self, surface, offset):
-        elapsed = time.time() - self.start_time
-        progress = min(1.0, elapsed / self.lifespan)
-        current_alpha = int(255 * (1 - progress**2))
-        if current_alpha <= 0: return
-
-        part_color = self.color[:3] + (current_alpha,)
-        int_radius = int(self.radius)
-
-        try:
-            temp_surf = pygame.Surface((int_radius * 2, int_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surf, part_color, (int_radius, int_radius), int_radius)
-            surface.blit(temp_surf,
-                        (self.position.x - int_radius + offset.x, self.position.y - int_radius + offset.y),
-                        special_flags=pygame.BLEND_RGBA_ADD)
-        except (pygame.error, ValueError):
-            return
+            queue.additive_seq.append((flash_surf,
+                        (self.position.x - int_radius + offset.x, self.position.y - int_radius + offset.y)))
 
 
 class Ball:
     """Main ball entity with physics, collisions, and visual effects"""
 
-    def __init__(self, position, velocity, radius, color, ball_id=None):
-        self.position = pygame.Vector2(position)
-        self.velocity = pygame.Vector2(velocity)
-        self.radius = radius
+    __slots__ = ('px', 'py', 'vx', 'vy', 'radius', 'mass', 'id',
+                 'base_color', 'current_color', 'hue', '_s', '_v', '_a', '_rgb',
+                 'last_positions', 'hit_wall_effect_info', 'should_remove',
+                 'pulse_offset', 'pulse_frequency', 'color_shift_rate', 'color_shift_direction',
+                 'color_oscillation_factor')
 
-        if not isinstance(color, pygame.Color):
-            self.base_color = pygame.Color(color)
-        else:
-            self.base_color = pygame.Color(color.r, color.g, color.b, color.a)
+    def __init__(self, position, velocity, radius, color, ball_id=None, hue=None):
+        # Physics state is kept as raw floats; position/velocity wrap them as Vector2 on demand
+        self.px, self.py = position[0], position[1]
+        self.vx, self.vy = velocity[0], velocity[1]
+        self.radius = radius
 
-        self.current_color = pygame.Color(self.base_color)
+        self.set_color(color, hue)
         self.mass = BASE_DENSITY * self.radius**2
-        self.last_positions = []
+        self.last_positions = collections.deque(maxlen=TRAIL_LENGTH) # Integer (x, y) trail points, oldest first
         self.hit_wall_effect_info = None
         self.should_remove = False
 
@@ -105,31 +122,18 @@ class Ball:
         self.color_shift_direction = random.choice([-1, 1])
         self.color_oscillation_factor = COLOR_SHIFT_OSCILLATION
 
-        # Use time-based gravity from game_state
-        self.gravity_strength = game_state.get_current_value(INITIAL_GRAVITY_STRENGTH, FINAL_GRAVITY_STRENGTH)
-
-        try:
-            self.hue = self.base_color.hsva[0]
-        except ValueError:
-            self.hue = random.uniform(0, 360)
-            self.current_color.hsva = (self.hue, 100, 100, 100)
-            print(f"Warning: Initial color HSVA failed, resetting ball color.")
-
         if ball_id is None:
             self.id = game_state.next_ball_id
             game_state.next_ball_id += 1
         else:
             self.id = ball_id
 
-    def update(self, dt):
-        if dt > 0:
-            self.last_positions.append(pygame.Vector2(self.position))
-            if len(self.last_positions) > TRAIL_LENGTH:
-                self.last_positions.pop(0)
+    def update(self, dt, params, now):
+        if dt > 0 and TRAIL_LENGTH > 0:
+            self.last_positions.append((int(self.px), int(self.py)))
 
         # --- Growth & Color Change based on chaos_factor ---
-        current_growth_rate = game_state.get_current_value(INITIAL_GROWTH_RATE, FINAL_GROWTH_RATE)
-        self.radius += current_growth_rate * dt
+        self.radius += params.growth_rate * dt
 
         # Only mark for removal if BALLS_CAN_DIE is True
         if self.radius < MIN_RADIUS and BALLS_CAN_DIE:
@@ -139,174 +143,339 @@ class Ball:
             # Ensure radius never goes below MIN_RADIUS
             self.radius = max(MIN_RADIUS, self.radius)
 
-        # Update color
-        elapsed_time_sim = time.time() # Use absolute time for smoother oscillation
-        if self.color_oscillation_factor > 0:
-            oscillation = math.sin(elapsed_time_sim * 0.3) * self.color_oscillation_factor
-            shift_amount = (self.color_shift_rate + oscillation) * dt
-        else:
-            shift_amount = self.color_shift_rate * dt
-
-        self.hue = (self.hue + (self.color_shift_direction * shift_amount)) % 360
-
-        try:
-            h_ignored, s, v, a = self.current_color.hsva
-            pulse_value = (math.sin(elapsed_time_sim * 0.2 + self.pulse_offset) + 1) / 2
-            s = max(80, min(100, 80 + pulse_value * 20))
-            v = max(85, min(100, 85 + pulse_value * 15))
-            a = max(0, min(100, a))
-            self.current_color.hsva = (self.hue, s, v, a)
-        except ValueError:
-            self.current_color.hsva = (self.hue, 90, 95, 100)
+        # Update color (the shared oscillation wave is evaluated once per frame in begin_frame)
+        shift_amount = (self.color_shift_rate + params.color_wave * self.color_oscillation_factor) * dt
+        hue = (self.hue + (self.color_shift_direction * shift_amount)) % 360
+        self.hue = hue
+
+        # RGB comes from the color table; current_color is only rewritten when that entry changes
+        pulse_value = (fsin(now * 0.2 + self.pulse_offset) + 1) / 2
+        self._s = 80 + pulse_value * 20
+        self._v = 85 + pulse_value * 15
+        rgb = _BALL_COLOR_LUT[int(hue) % 360][int(pulse_value * 10 + 0.5)]
+        if rgb != self._rgb:
+            self._rgb = rgb
+            color = self.current_color
+            color.r, color.g, color.b = rgb
 
         self.mass = BASE_DENSITY * self.radius**2
 
-        # ----- GRAVITY -----
-        # Update gravity strength based on chaos factor
-        self.gravity_strength = game_state.get_current_value(INITIAL_GRAVITY_STRENGTH, FINAL_GRAVITY_STRENGTH)
-
-        to_center = CENTER - self.position
-        dist_sq = to_center.length_squared()
-        if dist_sq > 1e-4:
-            distance = math.sqrt(dist_sq)
-
-            if distance > GRAVITY_CENTER_DEADZONE:
-                adjusted_distance = distance - GRAVITY_CENTER_DEADZONE
-                normalized_dist = min(1.0, adjusted_distance / (CONTAINER_RADIUS - GRAVITY_CENTER_DEADZONE))
-
-                current_gravity = self.gravity_strength
-                gravity_falloff = 1.0 / (0.2 + normalized_dist * normalized_dist)
-                gravity_force = to_center.normalize() * current_gravity * self.mass * gravity_falloff
-                gravity_accel = gravity_force / self.mass if self.mass > 1e-9 else pygame.Vector2(0,0)
-                self.velocity += gravity_accel * dt
-
-            elif distance < GRAVITY_CENTER_DEADZONE * 0.5 and random.random() < 0.05:
-                nudge_dir = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
-                self.velocity += nudge_dir * random.uniform(10, 30)
-
-        # Apply Drag based on chaos_factor
-        current_drag = game_state.get_current_value(INITIAL_DRAG_COEFFICIENT, FINAL_DRAG_COEFFICIENT)
-        # Ensure drag never exceeds 1.0
-        self.velocity *= min(1.0, current_drag)
-
-        # Update position
-        self.position += self.velocity * dt
-
-        # Clamp velocity based on chaos_factor
-        current_max_velocity = game_state.get_current_value(INITIAL_MAX_VELOCITY, FINAL_MAX_VELOCITY)
-        speed_sq = self.velocity.length_squared()
-        if speed_sq > current_max_velocity * current_max_velocity:
-            self.velocity.scale_to_length(current_max_velocity)
-
-        # Boundary collision
-        dist_from_center = self.position.distance_to(CENTER)
-        if dist_from_center + self.radius > CONTAINER_RADIUS:
-            overlap = (dist_from_center + self.radius) - CONTAINER_RADIUS
-            if dist_from_center > 1e-6:
-                normal = (self.position - CENTER).normalize()
-            else:
-                normal = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
-                if normal.length() < 1e-6: normal = pygame.Vector2(1, 0)
-
-            self.position -= normal * overlap
-
-            # Apply wall shrink based on chaos_factor
-            wall_impact = abs(self.velocity.dot(normal)) / 1000.0
-            current_wall_shrink_factor = game_state.get_current_value(INITIAL_COLLISION_SHRINK_FACTOR, FINAL_COLLISION_SHRINK_FACTOR) * 0.1 # Wall shrink less than ball-ball
-            size_loss = self.radius * current_wall_shrink_factor * wall_impact
-            self.radius = max(MIN_RADIUS, self.radius - size_loss)
-            self.mass = BASE_DENSITY * self.radius**2
-
-            # Bounce elasticity based on chaos_factor
-            current_wall_elasticity = game_state.get_current_value(INITIAL_WALL_ELASTICITY, FINAL_WALL_ELASTICITY)
-            
-            self.velocity.reflect_ip(normal)
-            self.velocity *= current_wall_elasticity
-
-            # Add tangential velocity boost based on chaos_factor
-            if random.random() < 0.1 + game_state.chaos_factor * 0.3: # More chance later
-                tangent = pygame.Vector2(-normal.y, normal.x)
-                tangent_strength = self.velocity.length() * random.uniform(0.05, 0.1 + 0.1 * game_state.chaos_factor) # Stronger later
-                self.velocity += tangent * tangent_strength * random.choice([-1, 1])
-
-            # Trigger wall hit effects
-            impact_pos = self.position + normal * self.radius
-            flash_color = pygame.Color('white')
-            flash_radius = self.radius * 0.9
-            self.hit_wall_effect_info = {'pos': impact_pos, 'color': flash_color, 'radius': flash_radius}
-
-            audio_volume = 0.5 + (min(1.0, abs(self.velocity.dot(normal)) / 1000.0) * 0.5)
-            audio_manager.play('collision', audio_volume, self.position)
-
+        # Gravity, drag, integration and wall detection run batched in BallSystem.step
         return True
 
-    def draw(self, surface, current_time, offset):
+    @property
+    def position(self):
+        return pygame.Vector2(self.px, self.py)
+
+    @position.setter
+    def position(self, value):
+        self.px, self.py = value[0], value[1]
+
+    @property
+    def velocity(self):
+        return pygame.Vector2(self.vx, self.vy)
+
+    @velocity.setter
+    def velocity(self, value):
+        self.vx, self.vy = value[0], value[1]
+
+    def set_color(self, color, hue=None):
+        """
+        Reset the ball's base and current color, re-seeding the cached HSV floats
+
+        Args:
+            color: pygame Color or (r, g, b) tuple
+            hue: Known hue of a ball color table entry (see set_hue); skips the RGB -> HSV conversion
+        """
+        self.base_color = pygame.Color(color)
+        self.current_color = pygame.Color(color)
+        if hue is not None:
+            self.hue, self._s, self._v, self._a = hue, 90.0, 92.5, 100 # Pulse step 5 of the color table
+        else:
+            try:
+                self.hue, self._s, self._v, self._a = self.base_color.hsva
+            except ValueError:
+                self.hue, self._s, self._v, self._a = random.uniform(0, 360), 100, 100, 100
+                self.current_color.hsva = (self.hue, self._s, self._v, self._a)
+                print(f"Warning: Initial color HSVA failed, resetting ball color.")
+        self._a = max(0, min(100, self._a))
+        self._rgb = (self.current_color.r, self.current_color.g, self.current_color.b)
+
+    def set_hue(self, hue):
+        """Recolor the ball straight from the color table"""
+        hue %= 360
+        self.set_color(_BALL_COLOR_LUT[int(hue) % 360][5], hue)
+
+    def bounce_off_wall(self, dist_from_center, params):
+        """
+        Resolve a container wall hit detected by BallSystem.step
+
+        Args:
+            dist_from_center: Distance from the container center after integration
+            params: FrameParams for the current frame
+        """
+        overlap = (dist_from_center + self.radius) - CONTAINER_RADIUS
+        if dist_from_center > 1e-6:
+            # Distance is already known, so normalize with a scalar instead of a second sqrt
+            inv_d = 1.0 / dist_from_center
+            nx = (self.px - CENTER_X) * inv_d
+            ny = (self.py - CENTER_Y) * inv_d
+        else:
+            angle = random.uniform(0, 2 * math.pi)
+            nx, ny = math.cos(angle), math.sin(angle)
+
+        self.px -= nx * overlap
+        self.py -= ny * overlap
+
+        # Apply wall shrink based on chaos_factor
+        vx, vy = self.vx, self.vy
+        vel_along_normal = vx * nx + vy * ny
+        wall_impact = abs(vel_along_normal) / 1000.0
+        size_loss = self.radius * params.wall_shrink * wall_impact
+        self.radius = max(MIN_RADIUS, self.radius - size_loss)
+        self.mass = BASE_DENSITY * self.radius**2
+
+        # Reflect about the normal, then apply elasticity based on chaos_factor
+        vx -= 2 * vel_along_normal * nx
+        vy -= 2 * vel_along_normal * ny
+        vx *= params.wall_elasticity
+        vy *= params.wall_elasticity
+
+        # Add tangential velocity boost based on chaos_factor
+        if random.random() < 0.1 + params.chaos * 0.3: # More chance later
+            tangent_strength = math.hypot(vx, vy) * random.uniform(0.05, 0.1 + 0.1 * params.chaos) # Stronger later
+            tangent_strength *= random.choice([-1, 1])
+            vx -= ny * tangent_strength
+            vy += nx * tangent_strength
+
+        self.vx, self.vy = vx, vy
+
+        # Trigger wall hit effects
+        impact_pos = pygame.Vector2(self.px + nx * self.radius, self.py + ny * self.radius)
+        flash_color = pygame.Color('white')
+        flash_radius = self.radius * 0.9
+        self.hit_wall_effect_info = {'pos': impact_pos, 'color': flash_color, 'radius': flash_radius}
+
+        audio_volume = 0.5 + (min(1.0, abs(vx * nx + vy * ny) / 1000.0) * 0.5)
+        audio_manager.play('collision', audio_volume, self.position)
+
+    def draw(self, queue, current_time, offset):
+        """
+        Queue the ball's sprites. Trail and bloom go on queue.additive_seq (the caller flushes
+        them onto its glow layer); core and haze go on queue.alpha_seq, in draw order.
+        """
         int_radius = max(1, int(self.radius))
+        glow_seq = queue.additive_seq
+        alpha_seq = queue.alpha_seq
 
         # --- Draw Trail ---
-        if TRAIL_LENGTH > 0 and len(self.last_positions) > 0:
-            num_trail_points = len(self.last_positions)
-            for i, pos in enumerate(reversed(self.last_positions)):
-                trail_alpha = int(TRAIL_ALPHA_START * ((num_trail_points - 1 - i) / num_trail_points))
-                if trail_alpha > 5:
-                    trail_color = self.current_color[:3] + (trail_alpha,)
-                    trail_draw_radius = max(1, int(self.radius * ((num_trail_points - i) / (num_trail_points + 1))))
-                    try:
-                        temp_surf = pygame.Surface((trail_draw_radius * 2, trail_draw_radius * 2), pygame.SRCALPHA)
-                        pygame.draw.circle(temp_surf, trail_color, (trail_draw_radius, trail_draw_radius), trail_draw_radius)
-                        surface.blit(temp_surf,
-                                    (pos.x - trail_draw_radius + offset.x, pos.y - trail_draw_radius + offset.y),
-                                    special_flags=pygame.BLEND_RGBA_ADD)
-                    except (pygame.error, ValueError):
-                        continue
+        num_trail_points = len(self.last_positions)
+        if num_trail_points > 0:
+            rgb = self._rgb
+            try:
+                trail = _trail_sprites(num_trail_points, int(self.radius * 4), (rgb[0] & 0xF8, rgb[1] & 0xF8, rgb[2] & 0xF8))
+            except (pygame.error, ValueError):
+                trail = ()
+            ox, oy = offset.x, offset.y
+            last_pos = None
+            for (temp_surf, trail_draw_radius), pos in zip(trail, reversed(self.last_positions)):
+                if pos == last_pos:
+                    continue # Ball didn't move a whole pixel, nothing new to draw
+                last_pos = pos
+                glow_seq.append((temp_surf, (pos[0] - trail_draw_radius + ox, pos[1] - trail_draw_radius + oy)))
 
         # --- Advanced Glow ---
-        pulse = (math.sin(current_time * self.pulse_frequency + self.pulse_offset) + 1) / 2
+        pulse = (fsin(current_time * self.pulse_frequency + self.pulse_offset) + 1) / 2
 
         # 1. Core Ball
-        try:
-            h, s, v, a = self.current_color.hsva
-            core_v = max(0, min(100, v * (1.0 + pulse * 0.1)))
-            core_color = pygame.Color(0); core_color.hsva = (h, s, core_v, a)
-        except ValueError:
-            core_color = self.current_color
+        core_v = min(100, self._v * (1.0 + pulse * 0.1))
+        core_color = pygame.Color(0); core_color.hsva = (self.hue, self._s, core_v, self._a)
 
-        pygame.draw.circle(surface, core_color, self.position + offset, int_radius)
+        try:
+            core_surf = get_disc_sprite(int_radius, core_color)
+            alpha_seq.append((core_surf, (self.px - int_radius + offset.x, self.py - int_radius + offset.y)))
+        except (pygame.error, ValueError):
+            pass
 
         # 2. Bright Bloom Layer (Additive)
         bloom_radius = self.radius * GLOW_BLOOM_SIZE_FACTOR * (1.0 + pulse * PULSE_AMPLITUDE_BLOOM * 0.2)
         int_bloom_radius = max(1, int(bloom_radius))
-        bloom_size = int_bloom_radius * 2
-        bloom_intensity = GLOW_BLOOM_INTENSITY * (1.0 + pulse * PULSE_AMPLITUDE_BLOOM)
+        bloom_intensity = int(GLOW_BLOOM_INTENSITY * (1.0 + pulse * PULSE_AMPLITUDE_BLOOM))
 
         try:
-            bloom_surf = pygame.Surface((bloom_size, bloom_size), pygame.SRCALPHA)
-            bloom_h, bloom_s, bloom_v, bloom_a = self.current_color.hsva
-            bloom_s_adjusted = max(0, min(100, bloom_s * 0.8))
-            bloom_color_base = pygame.Color(0); bloom_color_base.hsva = (bloom_h, bloom_s_adjusted, 100, 100)
-            add_color_r = max(0, min(bloom_color_base.r, int(bloom_intensity)))
-            add_color_g = max(0, min(bloom_color_base.g, int(bloom_intensity)))
-            add_color_b = max(0, min(bloom_color_base.b, int(bloom_intensity)))
-            add_color = pygame.Color(add_color_r, add_color_g, add_color_b)
-            pygame.draw.circle(bloom_surf, add_color, (int_bloom_radius, int_bloom_radius), int_bloom_radius)
-            surface.blit(bloom_surf,
-                        (self.position.x - int_bloom_radius + offset.x, self.position.y - int_bloom_radius + offset.y),
-                        special_flags=pygame.BLEND_RGB_ADD)
+            bloom_color_base = pygame.Color(0); bloom_color_base.hsva = (self.hue, min(100, self._s * 0.8), 100, 100)
+            add_rgb = (min(bloom_color_base.r, bloom_intensity),
+                       min(bloom_color_base.g, bloom_intensity),
+                       min(bloom_color_base.b, bloom_intensity))
+            bloom_surf = get_glow_sprite(int_bloom_radius, add_rgb, 255)
+            glow_seq.append((bloom_surf,
+                        (self.px - int_bloom_radius + offset.x, self.py - int_bloom_radius + offset.y)))
         except (ValueError, pygame.error):
             pass
 
         # 3. Soft Haze Layer (Alpha Blend)
         haze_radius = self.radius * GLOW_HAZE_SIZE_FACTOR * (1.0 + pulse * PULSE_AMPLITUDE_HAZE * 0.1)
         int_haze_radius = max(1, int(haze_radius))
-        haze_size = int_haze_radius * 2
         haze_alpha = GLOW_HAZE_ALPHA * (1.0 + pulse * PULSE_AMPLITUDE_HAZE)
         haze_alpha = max(0, min(255, int(haze_alpha)))
 
         try:
-            haze_surf = pygame.Surface((haze_size, haze_size), pygame.SRCALPHA)
-            haze_color = self.current_color[:3] + (haze_alpha,)
-            pygame.draw.circle(haze_surf, haze_color, (int_haze_radius, int_haze_radius), int_haze_radius)
-            surface.blit(haze_surf,
-                        (self.position.x - int_haze_radius + offset.x, self.position.y - int_haze_radius + offset.y))
+            haze_surf = get_haze_sprite(int_haze_radius, self._rgb, haze_alpha)
+            alpha_seq.append((haze_surf,
+                        (self.px - int_haze_radius + offset.x, self.py - int_haze_radius + offset.y)))
         except (pygame.error, ValueError):
-            pass
\ No newline at end of file
+            pass
+
+
+def make_ball(position, velocity, radius, hue):
+    """
+    Create a ball from a hue. The color comes from the ball color table, so construction
+    needs no RGB -> HSV conversion.
+
+    Args:
+        position: Spawn position (Vector2 or (x, y))
+        velocity: Initial velocity (Vector2 or (x, y))
+        radius: Ball radius
+        hue: Hue in degrees (any float, wrapped to 0-360)
+
+    Returns:
+        The new Ball
+    """
+    hue %= 360
+    return Ball(position, velocity, radius, _BALL_COLOR_LUT[int(hue) % 360][5], hue=hue)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _step_balls_kernel(state, dt, gravity, drag, max_velocity, deadzone, container_radius, cx, cy, dist_out):
+        """Compiled gravity/drag/integrate/clamp pass over (n, 5) pos/vel/radius rows, in place"""
+        max_vel_sq = max_velocity * max_velocity
+        falloff_span = container_radius - deadzone
+        for i in range(state.shape[0]):
+            px = state[i, 0]
+            py = state[i, 1]
+            vx = state[i, 2]
+            vy = state[i, 3]
+
+            dx = cx - px
+            dy = cy - py
+            d2 = dx * dx + dy * dy
+            if d2 > 1e-4:
+                d = math.sqrt(d2)
+                if d > deadzone:
+                    nd = min(1.0, (d - deadzone) / falloff_span)
+                    a = gravity / (0.2 + nd * nd) * dt / d
+                    vx += dx * a
+                    vy += dy * a
+
+            vx *= drag
+            vy *= drag
+            px += vx * dt
+            py += vy * dt
+
+            s2 = vx * vx + vy * vy
+            if s2 > max_vel_sq:
+                k = max_velocity / math.sqrt(s2)
+                vx *= k
+                vy *= k
+
+            ox = px - cx
+            oy = py - cy
+            dist_out[i] = math.sqrt(ox * ox + oy * oy)
+            state[i, 0] = px
+            state[i, 1] = py
+            state[i, 2] = vx
+            state[i, 3] = vy
+
+
+class BallSystem:
+    """Batched ball physics over Structure-of-Arrays NumPy state"""
+
+    def __init__(self, capacity=MAX_BALL_COUNT * 2):
+        # Columns: pos_x, pos_y, vel_x, vel_y, radius
+        self._state = np.zeros((capacity, 5))
+        self._dist = np.zeros(capacity)
+
+    def step(self, balls, dt, params):
+        """
+        Apply the dead-zone nudge, gravity, drag, integration, velocity clamp and wall detection to all balls at once
+
+        Args:
+            balls: List of Ball objects (state is gathered from and scattered back to them)
+            dt: Time delta in seconds
+            params: FrameParams for the current frame
+        """
+        n = len(balls)
+        if n == 0:
+            return
+        if n > len(self._state):
+            self._state = np.zeros((n * 2, 5))
+            self._dist = np.zeros(n * 2)
+
+        state = self._state[:n]
+        state[:] = [(b.px, b.py, b.vx, b.vy, b.radius) for b in balls]
+        dist_from_center = self._dist[:n]
+
+        # Random nudge for balls stuck in the dead zone (rare, so handled per ball). Tested on the
+        # pre-step position and applied before drag, integration and the velocity clamp
+        np.hypot(state[:, 0] - CENTER_X, state[:, 1] - CENTER_Y, out=dist_from_center)
+        stuck = (dist_from_center > 1e-2) & (dist_from_center < GRAVITY_CENTER_DEADZONE * 0.5)
+        for i in np.flatnonzero(stuck):
+            if random.random() < 0.05:
+                nudge_angle = random.uniform(0, 2 * math.pi)
+                nudge = random.uniform(10, 30)
+                state[i, 2] += math.cos(nudge_angle) * nudge
+                state[i, 3] += math.sin(nudge_angle) * nudge
+
+        if NUMBA_AVAILABLE:
+            _step_balls_kernel(state, dt, params.gravity, params.drag, params.max_velocity, GRAVITY_CENTER_DEADZONE,
+                               CONTAINER_RADIUS, CENTER_X, CENTER_Y, dist_from_center)
+        else:
+            self._step_numpy(state, dt, params, dist_from_center)
+
+        px, py, vx, vy, r = state.T
+        hit_wall = dist_from_center + r > CONTAINER_RADIUS
+
+        for ball, x, y, vel_x, vel_y in zip(balls, px.tolist(), py.tolist(), vx.tolist(), vy.tolist()):
+            ball.px, ball.py = x, y
+            ball.vx, ball.vy = vel_x, vel_y
+
+        for i in np.flatnonzero(hit_wall):
+            balls[i].bounce_off_wall(float(dist_from_center[i]), params)
+
+    def _step_numpy(self, state, dt, params, dist_out):
+        """Vectorized fallback for _step_balls_kernel when numba is not installed"""
+        n = len(state)
+        px, py, vx, vy, r = state.T
+
+        # ----- GRAVITY -----
+        # Mass cancels out of force/mass, so the acceleration is applied directly
+        dx = CENTER_X - px
+        dy = CENTER_Y - py
+        dist = np.sqrt(dx * dx + dy * dy)
+        pulled = dist > GRAVITY_CENTER_DEADZONE
+        normalized_dist = np.minimum(1.0, (dist - GRAVITY_CENTER_DEADZONE) / (CONTAINER_RADIUS - GRAVITY_CENTER_DEADZONE))
+        falloff = 1.0 / (0.2 + normalized_dist * normalized_dist)
+        accel = np.divide(params.gravity * falloff * dt, dist, out=np.zeros(n), where=pulled)
+        vx += dx * accel
+        vy += dy * accel
+
+        # Drag, then integrate
+        vx *= params.drag
+        vy *= params.drag
+        px += vx * dt
+        py += vy * dt
+
+        # Clamp velocity
+        speed_sq = vx * vx + vy * vy
+        fast = speed_sq > params.max_vel_sq
+        if fast.any():
+            scale = params.max_velocity / np.sqrt(speed_sq[fast])
+            vx[fast] *= scale
+            vy[fast] *= scale
+
+        dist_out[:] = np.hypot(px - CENTER_X, py - CENTER_Y)
+
+
+# Global ball physics system
+ball_system = BallSystem()
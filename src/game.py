@@ -3,54 +3,52 @@ import time
 import random
 from src.config import *
 from src.audio import audio_manager
-from src.entities import Particle, Effect
-from src.utilities import random_bright_color, spawn_particles, trigger_screen_shake
+from src.entities import Effect, ball_system
+from src.utilities import random_bright_color, random_bright_rgbs, spawn_particles, trigger_screen_shake, get_glow_sprite, DrawQueue, unit_components
 from src.physics import update_game_objects, create_initial_balls, spawn_fresh_ball
 from src.game_state import game_state
 from src.recording import recorder
 import math
+import numpy as np
 
 # Create a special effect class to use for beat effects
 class BeatEffect(Effect):
     """Special effect that matches the Effect update signature but uses Particle visuals"""
     
+    __slots__ = ('velocity', 'lifespan', 'last_update_time')
+    
     def __init__(self, position, velocity, color, lifespan, radius):
         super().__init__(position, color, radius, radius, lifespan)
         self.velocity = pygame.Vector2(velocity)
         self.start_radius = radius
-        self.start_time = time.time()
+        self.start_time = game_state.frame_time
         self.lifespan = lifespan
     
-    def update(self):
+    def update(self, now):
         # Move based on velocity
-        current_time = time.time()
-        dt = current_time - self.start_time - self.last_update_time if hasattr(self, 'last_update_time') else 0.016
-        self.last_update_time = current_time - self.start_time
+        dt = now - self.start_time - self.last_update_time if hasattr(self, 'last_update_time') else 0.016
+        self.last_update_time = now - self.start_time
         
         self.position += self.velocity * dt
         self.velocity *= 0.98  # Slight drag
         
         # Return True if the effect is still alive
-        return (current_time - self.start_time) < self.lifespan
+        return (now - self.start_time) < self.lifespan
     
-    def draw(self, surface, offset):
-        current_time = time.time()
-        elapsed = current_time - self.start_time
+    def draw(self, queue, now, offset):
+        elapsed = now - self.start_time
         progress = min(1.0, elapsed / self.lifespan)
         current_alpha = int(255 * (1 - progress**2))
         if current_alpha <= 0: return
 
-        part_color = self.color[:3] + (current_alpha,)
         int_radius = int(self.start_radius)
 
         try:
-            temp_surf = pygame.Surface((int_radius * 2, int_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surf, part_color, (int_radius, int_radius), int_radius)
-            surface.blit(temp_surf,
-                        (self.position.x - int_radius + offset.x, self.position.y - int_radius + offset.y),
-                        special_flags=pygame.BLEND_RGBA_ADD)
+            temp_surf = get_glow_sprite(int_radius, self.rgb, current_alpha)
         except (pygame.error, ValueError):
             return
+        queue.additive_seq.append((temp_surf,
+                        (self.position.x - int_radius + offset.x, self.position.y - int_radius + offset.y)))
 
 class GameRenderer:
     """Handles rendering for the game"""
@@ -67,6 +65,26 @@ class GameRenderer:
         self.beat_fade_speed = 5.0
         self.container_pulse = 0.0
         self.last_beat_time = 0
+        
+        # Shared additive layer for ball trails and bloom, composited once per frame
+        self.glow_accum = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        # Additive sprite blits are batched per layer and flushed in one call
+        self.draw_queue = DrawQueue()
+        
+        # Last (text, surface) per UI text slot; fonts are only re-rendered when the text changes
+        self._ui_cache = {}
+        self._info_refresh_time = 0.0 # Next time the FPS/Balls/Chaos line is rebuilt
+        
+        # Full-screen background-colored overlay for the intro and ending fades; only its alpha changes
+        self.fade_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.fade_surf.fill(BACKGROUND_COLOR)
+        
+        # Intro/ending titles are rendered once; per frame only their alpha changes
+        title_font = pygame.font.Font(None, 60)
+        subtitle_font = pygame.font.Font(None, 36)
+        self.intro_title_surf = title_font.render("Physics Simulation", True, (200, 200, 255))
+        self.intro_subtitle_surf = subtitle_font.render("Starting simulation...", True, (150, 150, 200))
+        self.ending_title_surf = title_font.render("Simulation Complete", True, (200, 200, 255))
 
     def render_frame(self, current_time):
         self.screen.fill(BACKGROUND_COLOR)
@@ -76,62 +94,78 @@ class GameRenderer:
         self.beat_pulse = max(0, self.beat_pulse - self.clock.get_time() / 1000.0 * self.beat_fade_speed)
         beat_intensity = audio_manager.get_beat_intensity()
         
-        # Make container react to music
-        container_alpha = 1.0 + beat_intensity * 0.5
+        # Make container react to music: radius, color and line width all pulse with the beat
         container_pulse_size = CONTAINER_RADIUS * (1.0 + self.beat_pulse * 0.03)
-        if container_alpha > 0.01:
-            # Base color that pulses with the beat
-            base_intensity = 15 + int(beat_intensity * 20)
-            r = base_intensity + int(self.beat_pulse * 50)
-            g = int(10 + beat_intensity * 15) + int(self.beat_pulse * 20)
-            b = int(20 + beat_intensity * 25) + int(self.beat_pulse * 30)
-            container_color = (min(255, r), min(255, g), min(255, b))
-            container_width = max(1, int(1 + 2 * container_alpha))
-            pygame.draw.circle(self.screen, container_color, CENTER + draw_offset, 
-                             container_pulse_size, container_width)
-
-        for particle in game_state.particles:
-            particle.draw(self.screen, draw_offset)
+        base_intensity = 15 + int(beat_intensity * 20)
+        r = base_intensity + int(self.beat_pulse * 50)
+        g = int(10 + beat_intensity * 15) + int(self.beat_pulse * 20)
+        b = int(20 + beat_intensity * 25) + int(self.beat_pulse * 30)
+        container_color = (min(255, r), min(255, g), min(255, b))
+        container_width = int(3 + beat_intensity) # Thickens to 4px only at full beat intensity
+        pygame.draw.circle(self.screen, container_color, CENTER + draw_offset, 
+                         container_pulse_size, container_width)
+
+        queue = self.draw_queue
+        game_state.particles.draw(queue, current_time, draw_offset)
+        queue.flush(self.screen) # Particles sit underneath the balls
+        self.glow_accum.fill((0, 0, 0, 0))
         for ball in game_state.balls:
-             ball.draw(self.screen, current_time, draw_offset)
+             ball.draw(queue, current_time, draw_offset)
+        queue.flush_alpha(self.screen) # Cores and haze, in ball order
+        queue.flush_additive(self.glow_accum)
+        self.screen.blit(self.glow_accum, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
         for effect in game_state.effects:
-             effect.draw(self.screen, draw_offset)
+             effect.draw(queue, current_time, draw_offset)
+        queue.flush(self.screen)
 
         if not game_state.intro_phase:
             self._draw_ui()
 
     def _draw_ui(self):
         try:
-            # Add BPM info to the UI
-            rhythm_info = audio_manager.get_rhythm_info()
-            info_text = f"FPS: {self.clock.get_fps():.1f} Balls: {len(game_state.balls)} Chaos: {game_state.chaos_factor:.2f}"
-            # if rhythm_info['bpm'] > 0:
-            #     info_text += f" BPM: {rhythm_info['bpm']}"
+            # Readouts refresh at 4 Hz; faster changes are unreadable flicker
+            if game_state.frame_time >= self._info_refresh_time:
+                # Add BPM info to the UI
+                rhythm_info = audio_manager.get_rhythm_info()
+                fps = round(self.clock.get_fps() * 2) / 2 # Half-FPS steps so the text changes rarely
+                info_text = f"FPS: {fps:.1f} Balls: {len(game_state.balls)} Chaos: {game_state.chaos_factor:.2f}"
+                # if rhythm_info['bpm'] > 0:
+                #     info_text += f" BPM: {rhythm_info['bpm']}"
+                self._render_ui_text('info', info_text)
+                self._info_refresh_time = game_state.frame_time + 0.25 # Only after a successful render
                 
-            info_surf = self.font.render(info_text, True, pygame.Color('gray'))
-            self.screen.blit(info_surf, (10, 10))
+            self.screen.blit(self._ui_cache['info'][1], (10, 10))
 
             if game_state.game_start_time > 0:
-                elapsed_time = time.time() - game_state.game_start_time
+                elapsed_time = game_state.frame_time - game_state.game_start_time
                 time_remaining = MAX_GAME_DURATION - elapsed_time
                 if time_remaining > -5: # Show for a bit after 0
                     time_text = f"Time: {max(0, int(time_remaining))}s"
-                    time_surf = self.font.render(time_text, True, pygame.Color('gray'))
+                    time_surf = self._render_ui_text('time', time_text)
                     self.screen.blit(time_surf, (SCREEN_WIDTH - time_surf.get_width() - 10,
                                                 SCREEN_HEIGHT - time_surf.get_height() - 10))
         except pygame.error as e:
             print(f"Error rendering font: {e}")
+
+    def _render_ui_text(self, slot, text):
+        """Render UI text, reusing the slot's last surface while its text is unchanged"""
+        cached = self._ui_cache.get(slot)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        surf = self.font.render(text, True, pygame.Color('gray'))
+        self._ui_cache[slot] = (text, surf)
+        return surf
             
     def on_beat_detected(self):
         """React to beat detection with visual cues"""
         # Strong pulse when a beat is detected
         self.beat_pulse = 1.0
-        self.last_beat_time = time.time()
+        self.last_beat_time = game_state.frame_time
         
         # Container pulse animation gets boosted on beats
         self.container_pulse = 1.0
 
-    def render_intro(self, intro_progress):
+    def render_intro(self, intro_progress, now):
         self.screen.fill(BACKGROUND_COLOR)
         
         # Make container pulse with music during intro
@@ -150,26 +184,20 @@ class GameRenderer:
         
         pygame.draw.circle(self.screen, container_color, CENTER, container_size, 2)
 
-        title_font = pygame.font.Font(None, 60)
-        if title_font:
-            title_alpha = min(255, int(255 * (intro_progress * 1.5)))
-            title_text = "Physics Simulation"
-            title_surf = title_font.render(title_text, True, (200, 200, 255))
-            title_surf.set_alpha(title_alpha)
-            
-            # Add slight title movement with the beat
-            title_offset_y = math.sin(time.time() * 3) * beat_intensity * 5
-            self.screen.blit(title_surf, (SCREEN_WIDTH//2 - title_surf.get_width()//2, 
-                                        SCREEN_HEIGHT//3 + title_offset_y))
+        title_alpha = min(255, int(255 * (intro_progress * 1.5)))
+        title_surf = self.intro_title_surf
+        title_surf.set_alpha(title_alpha)
+        
+        # Add slight title movement with the beat
+        title_offset_y = math.sin(now * 3) * beat_intensity * 5
+        self.screen.blit(title_surf, (SCREEN_WIDTH//2 - title_surf.get_width()//2, 
+                                    SCREEN_HEIGHT//3 + title_offset_y))
 
         if intro_progress > 0.5:
-            subtitle_font = pygame.font.Font(None, 36)
-            if subtitle_font:
-                subtitle_alpha = min(255, int(255 * ((intro_progress - 0.5) * 2.0)))
-                subtitle_text = "Starting simulation..."
-                subtitle_surf = subtitle_font.render(subtitle_text, True, (150, 150, 200))
-                subtitle_surf.set_alpha(subtitle_alpha)
-                self.screen.blit(subtitle_surf, (SCREEN_WIDTH//2 - subtitle_surf.get_width()//2, SCREEN_HEIGHT//2))
+            subtitle_alpha = min(255, int(255 * ((intro_progress - 0.5) * 2.0)))
+            subtitle_surf = self.intro_subtitle_surf
+            subtitle_surf.set_alpha(subtitle_alpha)
+            self.screen.blit(subtitle_surf, (SCREEN_WIDTH//2 - subtitle_surf.get_width()//2, SCREEN_HEIGHT//2))
 
         # Create particles timed with the beat
         particle_chance = 0.2 + intro_progress * 0.4
@@ -178,14 +206,16 @@ class GameRenderer:
         if random.random() < (particle_chance + beat_boost):
             angle = random.uniform(0, 2 * math.pi)
             dist = random.uniform(CONTAINER_RADIUS, CONTAINER_RADIUS * 1.2)
-            pos = CENTER + pygame.Vector2(math.cos(angle), math.sin(angle)) * dist
-            vel = (CENTER - pos).normalize() * random.uniform(100, 200)
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            pos = (CENTER_X + cos_a * dist, CENTER_Y + sin_a * dist)
+            speed = random.uniform(100, 200)
+            vel = (-cos_a * speed, -sin_a * speed) # Straight toward CENTER
             color = random_bright_color()
-            game_state.particles.append(Particle(pos, vel, color, 1.0, 3))
+            game_state.particles.emit(pos, vel, color, 1.0, 3, now)
 
-        game_state.particles = [p for p in game_state.particles if p.update(1/60)]
-        for particle in game_state.particles:
-            particle.draw(self.screen, pygame.Vector2(0, 0))
+        game_state.particles.update(1/60, now)
+        game_state.particles.draw(self.draw_queue, now, pygame.Vector2(0, 0))
+        self.draw_queue.flush(self.screen)
 
         if intro_progress > 0.8 and len(game_state.balls) == 0:
             create_initial_balls() # Create balls hidden
@@ -194,47 +224,53 @@ class GameRenderer:
             fade_factor = max(0, (1.0 - intro_progress) / 0.1)
             fade_alpha = int(255 * fade_factor)
             if fade_alpha > 0:
-                fade_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                fade_surf.fill((5, 0, 10, fade_alpha))
-                self.screen.blit(fade_surf, (0, 0))
-
-    def render_ending(self, ending_progress):
-        self.render_frame(time.time())
+                self.fade_surf.set_alpha(fade_alpha)
+                self.screen.blit(self.fade_surf, (0, 0))
 
-        # Apply fade overlay
+    def render_ending(self, ending_progress, now):
         fade_alpha = min(255, int(255 * ending_progress * 1.5)) # Faster fade
-        fade_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        fade_surf.fill(BACKGROUND_COLOR)
-        fade_surf.set_alpha(fade_alpha)
-        self.screen.blit(fade_surf, (0, 0))
+        if fade_alpha >= 255:
+            # The overlay hides the whole scene from here on, so skip drawing it
+            self.screen.fill(BACKGROUND_COLOR)
+        else:
+            self.render_frame(now)
 
-        title_font = pygame.font.Font(None, 60)
-        if title_font:
-            if ending_progress > 0.2 and ending_progress < 0.9:
-                text_alpha = min(255, int(255 * math.sin(math.pi * (ending_progress - 0.2) / 0.7))) # Sine fade in/out
-                text = "Simulation Complete"
-                text_surf = title_font.render(text, True, (200, 200, 255))
-                text_surf.set_alpha(text_alpha)
-                self.screen.blit(text_surf, (SCREEN_WIDTH//2 - text_surf.get_width()//2, SCREEN_HEIGHT//2 - 40))
+            # Apply fade overlay
+            self.fade_surf.set_alpha(fade_alpha)
+            self.screen.blit(self.fade_surf, (0, 0))
+
+        if ending_progress > 0.2 and ending_progress < 0.9:
+            text_alpha = min(255, int(255 * math.sin(math.pi * (ending_progress - 0.2) / 0.7))) # Sine fade in/out
+            text_surf = self.ending_title_surf
+            text_surf.set_alpha(text_alpha)
+            self.screen.blit(text_surf, (SCREEN_WIDTH//2 - text_surf.get_width()//2, SCREEN_HEIGHT//2 - 40))
 
 
 class Game:
     """Main game class"""
 
     def __init__(self):
-        pygame.init()
+        # Only the modules the game needs; pygame.init() would also start the mixer, which
+        # audio_manager opens itself (with MIXER_BUFFER) the first time a sound is needed
+        pygame.display.init()
         pygame.font.init()
-        flags = pygame.DOUBLEBUF
+        # SCALED presents through SDL's GPU renderer; the screen surface stays SCREEN_WIDTH x SCREEN_HEIGHT
+        # No vsync: clock.tick(FPS) paces the loop, and waiting on the monitor as well stalls flip()
+        flags = pygame.DOUBLEBUF | pygame.SCALED
         try:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags, vsync=0)
         except pygame.error:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Physics Simulation")
+        # Only queue the events we handle; mouse motion and the rest are dropped inside SDL
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT])
+        self._event_handlers = {pygame.QUIT: self._on_quit}
 
         self.renderer = GameRenderer(self.screen)
         audio_manager.initialize()
         game_state.reset()
-        game_state.intro_start_time = time.time()
+        game_state.intro_start_time = time.perf_counter()
         recorder.start_recording()
         
         # Beat-related state
@@ -244,20 +280,20 @@ class Game:
 
     def run(self):
         try:
-            last_frame_time = time.time()
+            last_frame_time = time.perf_counter()
             
             while game_state.running:
                 # Handle events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        game_state.running = False
+                self._handle_events()
                         
-                # Calculate frame timing
-                current_time = time.time()
+                # Calculate frame timing; everything else this frame reads game_state.frame_time
+                current_time = time.perf_counter()
+                game_state.frame_time = current_time
                 frame_delta = current_time - last_frame_time
                 last_frame_time = current_time
                 
                 # Update audio analysis and detect beats
+                audio_manager.tick(int(current_time * 1e9))
                 beat_detected = audio_manager.update()
                 
                 if beat_detected:
@@ -292,11 +328,21 @@ class Game:
             traceback.print_exc()
             self._cleanup()
 
+    def _handle_events(self):
+        """Drain the event queue, dispatching each event by type"""
+        for event in pygame.event.get():
+            handler = self._event_handlers.get(event.type)
+            if handler:
+                handler(event)
+
+    def _on_quit(self, event):
+        game_state.running = False
+
     def _on_beat_detected(self):
         """Handle beat detection with visual effects"""
         # Notify renderer of beat
         self.renderer.on_beat_detected()
-        self.last_beat_time = time.time()
+        self.last_beat_time = game_state.frame_time
         
         # Create beat-synchronized particles
         self._create_beat_particles()
@@ -317,7 +363,7 @@ class Game:
     def _create_beat_particles(self):
         """Create particles that sync with the beat"""
         # Skip if on cooldown
-        current_time = time.time()
+        current_time = game_state.frame_time
         if current_time < self.next_beat_particle_time:
             return
             
@@ -328,21 +374,21 @@ class Game:
         chaos = game_state.chaos_factor
         particle_count = int(5 + chaos * 10)
         
-        for _ in range(particle_count):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(50, CONTAINER_RADIUS * 0.8)
-            pos = CENTER + pygame.Vector2(math.cos(angle), math.sin(angle)) * distance
-            
-            # Velocity points outward from center with beat timing
-            vel_magnitude = 100 + random.uniform(0, 200) * (1 + chaos * 0.5)
-            vel = pygame.Vector2(math.cos(angle), math.sin(angle)) * vel_magnitude
-            
-            # Create bright particle with longer life
-            color = random_bright_color()
-            lifespan = 0.5 + random.uniform(0, 0.5)
-            radius = 2 + random.uniform(0, 3)
-            
-            game_state.particles.append(Particle(pos, vel, color, lifespan, radius))
+        angle = np.random.uniform(0, 2 * math.pi, particle_count)
+        distance = np.random.uniform(50, CONTAINER_RADIUS * 0.8, particle_count)
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        
+        # Velocity points outward from center with beat timing
+        vel_magnitude = 100 + np.random.uniform(0, 200, particle_count) * (1 + chaos * 0.5)
+        
+        # Create bright particles with longer life
+        colors = random_bright_rgbs(particle_count)
+        lifespan = 0.5 + np.random.uniform(0, 0.5, particle_count)
+        radius = 2 + np.random.uniform(0, 3, particle_count)
+        
+        game_state.particles.emit_many(CENTER_X + cos_a * distance, CENTER_Y + sin_a * distance,
+                                       cos_a * vel_magnitude, sin_a * vel_magnitude, colors, lifespan, radius,
+                                       current_time)
     
     def _apply_beat_velocity_boost(self):
         """Apply a velocity boost to balls timed with the beat"""
@@ -357,17 +403,18 @@ class Game:
         
         for ball in boost_balls:
             # Calculate boost direction (random with slight bias toward center)
-            center_dir = (CENTER - ball.position).normalize()
-            random_dir = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
+            center_x, center_y = unit_components(CENTER_X - ball.px, CENTER_Y - ball.py)
+            random_x, random_y = unit_components(random.uniform(-1, 1), random.uniform(-1, 1))
             
             # Blend between random and center directions
             blend = random.uniform(0.2, 0.8)
-            boost_dir = center_dir * blend + random_dir * (1 - blend)
-            boost_dir = boost_dir.normalize()
+            boost_x, boost_y = unit_components(center_x * blend + random_x * (1 - blend),
+                                               center_y * blend + random_y * (1 - blend))
             
             # Apply velocity boost based on chaos level
             boost_magnitude = 50 + random.uniform(0, 150) * (1 + chaos)
-            ball.velocity += boost_dir * boost_magnitude
+            ball.vx += boost_x * boost_magnitude
+            ball.vy += boost_y * boost_magnitude
             
             # Create a visual effect at the ball's position using our compatible BeatEffect class
             game_state.effects.append(
@@ -375,11 +422,8 @@ class Game:
             )
 
     def _run_intro_phase(self, current_time, dt):
-        # Handle any additional events in the intro phase
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game_state.running = False
-                return
+        if not game_state.running:
+            return # Quit arrived in this frame's event pump
                 
         intro_progress = (current_time - game_state.intro_start_time) / INTRO_DURATION
 
@@ -387,8 +431,10 @@ class Game:
             transition_factor = (intro_progress - (1.0 - INTRO_FADE_OVERLAP)) / INTRO_FADE_OVERLAP
             reduced_dt = dt * transition_factor
             # Only update physics minimally during fade-in
+            params = game_state.begin_frame(current_time)
             for ball in game_state.balls:
-                ball.update(reduced_dt * 0.2) # Very slow update initially
+                ball.update(reduced_dt * 0.2, params, current_time) # Very slow update initially
+            ball_system.step(game_state.balls, reduced_dt * 0.2, params)
 
         if intro_progress >= 1.0:
             game_state.intro_phase = False
@@ -397,7 +443,7 @@ class Game:
             if len(game_state.balls) == 0:
                 create_initial_balls() # Ensure balls exist
         else:
-            self.renderer.render_intro(intro_progress)
+            self.renderer.render_intro(intro_progress, current_time)
 
 
     def _run_game_phase(self, current_time, dt, beat_detected):
@@ -410,7 +456,7 @@ class Game:
         beat_time_scale = 1.0 + (beat_intensity - 0.5) * 0.2  # Range from 0.9 to 1.1
         dt_scaled = dt * beat_time_scale
         
-        update_game_objects(dt_scaled, beat_intensity)
+        update_game_objects(dt_scaled, current_time, beat_intensity)
 
         # Check for end of game based on duration
         if elapsed_time >= MAX_GAME_DURATION and game_state.running:
@@ -425,22 +471,24 @@ class Game:
     def _run_ending_sequence(self, current_time):
         # End simulation smoothly
         ending_duration = 3.0
-        ending_start_time = time.time() # Use current time as start
+        ending_start_time = current_time # Start from the frame that triggered the ending
         ending_running = True
 
         # audio_manager.play('end', 1.0) # Play end sound
 
         while ending_running and game_state.running:
             # Handle events to prevent freezing
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    ending_running = False
-                    game_state.running = False
+            self._handle_events()
+            if not game_state.running:
+                ending_running = False
                         
-            ending_elapsed = time.time() - ending_start_time
+            now = time.perf_counter() # One timestamp for everything updated and drawn this frame
+            game_state.frame_time = now
+            ending_elapsed = now - ending_start_time
             ending_progress = min(1.0, ending_elapsed / ending_duration)
 
             # Update audio analysis
+            audio_manager.tick(int(now * 1e9))
             beat_detected = audio_manager.update()
             
             # Minimal physics update during fade out to keep things moving a bit
@@ -454,10 +502,10 @@ class Game:
             fade_factor = math.cos(ending_progress * math.pi * 0.5)  # Smooth fade from 1 to 0
             audio_manager.set_master_volume(fade_factor)
             
-            update_game_objects(dt * (1.0 - ending_progress) * beat_time_scale, beat_intensity) # Slow down physics
+            update_game_objects(dt * (1.0 - ending_progress) * beat_time_scale, now, beat_intensity) # Slow down physics
 
             # Render ending frame (which includes game state + fade)
-            self.renderer.render_ending(ending_progress)
+            self.renderer.render_ending(ending_progress, now)
             
             # Update display
             pygame.display.flip()
@@ -1,6 +1,60 @@
 import pygame
 import time
-from src.config import MAX_GAME_DURATION
+import math
+from dataclasses import dataclass
+from src.particles import ParticlePool
+from src.config import (MAX_GAME_DURATION, INITIAL_GRAVITY_STRENGTH, FINAL_GRAVITY_STRENGTH,
+                        INITIAL_DRAG_COEFFICIENT, FINAL_DRAG_COEFFICIENT, INITIAL_MAX_VELOCITY, FINAL_MAX_VELOCITY,
+                        INITIAL_WALL_ELASTICITY, FINAL_WALL_ELASTICITY, INITIAL_COLLISION_SHRINK_FACTOR,
+                        FINAL_COLLISION_SHRINK_FACTOR, INITIAL_GROWTH_RATE, FINAL_GROWTH_RATE,
+                        INITIAL_BALL_ELASTICITY, FINAL_BALL_ELASTICITY, INITIAL_SPLIT_CHANCE, FINAL_SPLIT_CHANCE,
+                        INITIAL_COLOR_DISTANCE_THRESHOLD, FINAL_COLOR_DISTANCE_THRESHOLD,
+                        INITIAL_SPLIT_MASS_LOSS_FACTOR, FINAL_SPLIT_MASS_LOSS_FACTOR,
+                        INITIAL_SHAKE_INTENSITY, FINAL_SHAKE_INTENSITY, INITIAL_SPAWN_RATE, FINAL_SPAWN_RATE)
+
+@dataclass(slots=True)
+class FrameParams:
+    """Chaos-interpolated values shared by every ball and collision within one frame"""
+    chaos: float
+    gravity: float
+    drag: float
+    max_velocity: float
+    max_vel_sq: float
+    wall_elasticity: float
+    wall_shrink: float
+    growth_rate: float
+    collision_shrink: float
+    ball_elasticity: float
+    split_chance: float
+    merge_threshold: float
+    split_mass_loss: float
+    shake_intensity: float
+    spawn_rate: float
+    color_wave: float = 0.0 # sin(0.3 * now), the hue-drift oscillation every ball shares this frame
+
+    @classmethod
+    def from_state(cls, state):
+        """Build the parameters once per frame from the current chaos_factor"""
+        max_velocity = state.get_current_value(INITIAL_MAX_VELOCITY, FINAL_MAX_VELOCITY)
+        collision_shrink = state.get_current_value(INITIAL_COLLISION_SHRINK_FACTOR, FINAL_COLLISION_SHRINK_FACTOR)
+        return cls(
+            chaos=state.chaos_factor,
+            gravity=state.get_current_value(INITIAL_GRAVITY_STRENGTH, FINAL_GRAVITY_STRENGTH),
+            drag=min(1.0, state.get_current_value(INITIAL_DRAG_COEFFICIENT, FINAL_DRAG_COEFFICIENT)), # Ensure drag never exceeds 1.0
+            max_velocity=max_velocity,
+            max_vel_sq=max_velocity * max_velocity,
+            wall_elasticity=state.get_current_value(INITIAL_WALL_ELASTICITY, FINAL_WALL_ELASTICITY),
+            wall_shrink=collision_shrink * 0.1, # Wall shrink less than ball-ball
+            growth_rate=state.get_current_value(INITIAL_GROWTH_RATE, FINAL_GROWTH_RATE),
+            collision_shrink=collision_shrink,
+            ball_elasticity=state.get_current_value(INITIAL_BALL_ELASTICITY, FINAL_BALL_ELASTICITY),
+            split_chance=state.get_current_value(INITIAL_SPLIT_CHANCE, FINAL_SPLIT_CHANCE),
+            merge_threshold=state.get_current_value(INITIAL_COLOR_DISTANCE_THRESHOLD, FINAL_COLOR_DISTANCE_THRESHOLD),
+            split_mass_loss=state.get_current_value(INITIAL_SPLIT_MASS_LOSS_FACTOR, FINAL_SPLIT_MASS_LOSS_FACTOR),
+            shake_intensity=state.get_current_value(INITIAL_SHAKE_INTENSITY, FINAL_SHAKE_INTENSITY),
+            spawn_rate=state.get_current_value(INITIAL_SPAWN_RATE, FINAL_SPAWN_RATE),
+        )
+
 
 class GameState:
     """
@@ -11,11 +65,12 @@ class GameState:
         self.intro_phase = True
         self.intro_start_time = 0
         self.game_start_time = 0
+        self.frame_time = 0.0 # time.perf_counter() taken once per frame by the game loop
         self.running = True
 
         # Entity collections
         self.balls = []
-        self.particles = []
+        self.particles = ParticlePool()
         self.effects = []
 
         # Ball ID counter
@@ -37,29 +92,46 @@ class GameState:
 
         # Time-based chaos factor (0.0 at start, 1.0 at MAX_GAME_DURATION)
         self.chaos_factor = 0.0
+        self.params = FrameParams.from_state(self)
 
     def reset(self):
         """Reset game state for a new game"""
         self.balls = []
-        self.particles = []
+        self.particles.clear()
         self.effects = []
         self.next_ball_id = 0
         self.intro_phase = True
-        self.intro_start_time = time.time()
+        self.intro_start_time = time.perf_counter()
         self.game_start_time = 0
         self.screen_shake_timer = 0.0
         self.current_screen_offset = pygame.Vector2(0, 0)
         self.chaos_factor = 0.0
+        self.params = FrameParams.from_state(self)
         self.running = True # Ensure running is true on reset
 
     def update_chaos_factor(self):
         """Update the chaos factor based on elapsed game time"""
         if self.game_start_time > 0 and not self.intro_phase:
-            elapsed_time = time.time() - self.game_start_time
+            elapsed_time = self.frame_time - self.game_start_time
             self.chaos_factor = min(1.0, elapsed_time / MAX_GAME_DURATION)
         else:
             self.chaos_factor = 0.0
 
+    def begin_frame(self, now):
+        """
+        Advance the chaos factor and compute every per-frame shared value once
+        
+        Args:
+            now: Frame timestamp (time.perf_counter())
+        
+        Returns:
+            The FrameParams for this frame (also kept on self.params)
+        """
+        self.update_chaos_factor()
+        self.params = FrameParams.from_state(self)
+        self.params.color_wave = math.sin(now * 0.3)
+        return self.params
+
     def get_current_value(self, initial_value, final_value):
         """Linearly interpolate between an initial and final value based on chaos_factor."""
         return initial_value + (final_value - initial_value) * self.chaos_factor
@@ -68,7 +140,7 @@ class GameState:
         """Get elapsed time since game started"""
         if self.game_start_time is None or self.game_start_time == 0:
             return 0
-        return time.time() - self.game_start_time
+        return self.frame_time - self.game_start_time
 
 # Global game state instance
 game_state = GameState()
\ No newline at end of file
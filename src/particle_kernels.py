@@ -0,0 +1,31 @@
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit('int64(float64[:], float64[:], float64[:], float64[:], float64[:], float64[:], int32[:], int64[:], '
+          'int64, float64, float64, float64)', cache=True, fastmath=True)
+    def step_particles(px, py, vx, vy, start_time, lifespan, int_radius, keep, count, dt, drag, now):
+        """
+        Compiled move/drag/expire pass over the first count particles of a ParticlePool.
+        Survivors are compacted to the front in order and keep[k] records each one's old index.
+
+        Returns:
+            Number of surviving particles
+        """
+        k = 0
+        for i in range(count):
+            if now - start_time[i] >= lifespan[i]:
+                continue
+            px[k] = px[i] + vx[i] * dt
+            py[k] = py[i] + vy[i] * dt
+            vx[k] = vx[i] * drag
+            vy[k] = vy[i] * drag
+            start_time[k] = start_time[i]
+            lifespan[k] = lifespan[i]
+            int_radius[k] = int_radius[i]
+            keep[k] = i
+            k += 1
+        return k
@@ -0,0 +1,151 @@
+import numpy as np
+from src.config import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.utilities import get_glow_sprite_fades
+from src.particle_kernels import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from src.particle_kernels import step_particles
+
+class ParticlePool:
+    """Structure-of-Arrays store for every live particle, updated and drawn in bulk"""
+
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.px = np.zeros(capacity)
+        self.py = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.start_time = np.zeros(capacity)
+        self.lifespan = np.ones(capacity)
+        self.int_radius = np.ones(capacity, dtype=np.int32)
+        self.sprites = np.empty(capacity, dtype=object) # Per-particle tuple of alpha-bucket sprites
+        self._keep = np.empty(capacity, dtype=np.int64) # Survivor source indices written by step_particles
+
+    def _arrays(self):
+        return (self.px, self.py, self.vx, self.vy, self.start_time, self.lifespan, self.int_radius, self.sprites)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.sprites[:] = None
+
+    def _reserve(self, needed):
+        """Grow storage by doubling until it holds needed particles, keeping the live prefix"""
+        capacity = len(self.px)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        n = self.count
+        old = self._arrays()
+        self._allocate(capacity)
+        for new_arr, old_arr in zip(self._arrays(), old):
+            new_arr[:n] = old_arr[:n]
+
+    def emit(self, position, velocity, color, lifespan, radius, now):
+        """
+        Add one particle to the pool
+
+        Args:
+            position: Spawn position (Vector2 or (x, y))
+            velocity: Initial velocity (Vector2 or (x, y))
+            color: pygame Color or (r, g, b[, a]) tuple
+            lifespan: Lifetime in seconds
+            radius: Particle radius in pixels
+            now: Spawn time, the frame timestamp (game_state.frame_time)
+        """
+        i = self.count
+        self._reserve(i + 1)
+        int_radius = max(1, int(radius))
+        self.px[i], self.py[i] = position[0], position[1]
+        self.vx[i], self.vy[i] = velocity[0], velocity[1]
+        self.start_time[i] = now
+        self.lifespan[i] = lifespan
+        self.int_radius[i] = int_radius
+        self.sprites[i] = get_glow_sprite_fades(int_radius, tuple(color[:3])) # Pre-rendered fade steps
+        self.count = i + 1
+
+    def emit_many(self, px, py, vx, vy, colors, lifespan, radius, now):
+        """
+        Add a burst of particles with one slice assignment per field
+
+        Args:
+            px, py: Spawn positions (arrays, or scalars shared by the whole burst)
+            vx, vy: Initial velocity arrays
+            colors: Sequence of pygame Colors or (r, g, b[, a]) tuples, one per particle
+            lifespan: Lifetime array in seconds
+            radius: Radius array in pixels
+            now: Spawn time, the frame timestamp (game_state.frame_time)
+        """
+        n = len(colors)
+        if n == 0:
+            return
+        i = self.count
+        end = i + n
+        self._reserve(end)
+        int_radius = np.maximum(1, np.asarray(radius).astype(np.int32))
+        self.px[i:end] = px
+        self.py[i:end] = py
+        self.vx[i:end] = vx
+        self.vy[i:end] = vy
+        self.start_time[i:end] = now
+        self.lifespan[i:end] = lifespan
+        self.int_radius[i:end] = int_radius
+        sprites = self.sprites
+        for k, r, color in zip(range(i, end), int_radius.tolist(), colors):
+            sprites[k] = get_glow_sprite_fades(r, tuple(color[:3])) # Element-wise, numpy would unpack a list of tuples
+        self.count = end
+
+    def update(self, dt, now):
+        """Move all particles, apply drag and drop the expired ones"""
+        n = self.count
+        if n == 0:
+            return
+        if NUMBA_AVAILABLE:
+            k = step_particles(self.px, self.py, self.vx, self.vy, self.start_time, self.lifespan,
+                               self.int_radius, self._keep, n, dt, 0.98, now)
+            if k < n:
+                self.sprites[:k] = self.sprites[self._keep[:k]]
+                self.sprites[k:n] = None # Release sprite references of dead particles
+                self.count = k
+            return
+
+        vx, vy = self.vx[:n], self.vy[:n]
+        self.px[:n] += vx * dt
+        self.py[:n] += vy * dt
+        vx *= 0.98 # Slight drag
+        vy *= 0.98
+
+        alive = (now - self.start_time[:n]) < self.lifespan[:n]
+        if not alive.all():
+            k = int(np.count_nonzero(alive))
+            for arr in self._arrays():
+                arr[:k] = arr[:n][alive]
+            self.sprites[k:n] = None # Release sprite references of dead particles
+            self.count = k
+
+    def draw(self, queue, now, offset):
+        """Queue every visible particle's fade sprite for one additive batch blit"""
+        n = self.count
+        if n == 0:
+            return
+        progress = np.minimum(1.0, (now - self.start_time[:n]) / self.lifespan[:n])
+        alpha = (255 * (1 - progress * progress)).astype(np.int32)
+        r = self.int_radius[:n]
+        x = self.px[:n] - r + offset.x
+        y = self.py[:n] - r + offset.y
+        # Cull faded-out and fully offscreen particles before any blit tuples are built
+        visible = np.flatnonzero((alpha > 0) & (x + 2 * r > 0) & (x < SCREEN_WIDTH) & (y + 2 * r > 0) & (y < SCREEN_HEIGHT))
+        if len(visible) == 0:
+            return
+
+        xs = x[visible].tolist()
+        ys = y[visible].tolist()
+        buckets = (alpha[visible] >> 5).tolist()
+        sprites = self.sprites[visible].tolist()
+        queue.additive_seq.extend([(fades[bucket], (x, y)) for fades, bucket, x, y in zip(sprites, buckets, xs, ys)])
@@ -3,8 +3,8 @@ import math
 import random
 import time
 from src.config import *
-from src.entities import Ball, Effect
-from src.utilities import color_distance, lerp_color, spawn_particles, trigger_screen_shake
+from src.entities import Ball, Effect, ball_system, make_ball
+from src.utilities import color_distance, lerp_color, spawn_particles, trigger_screen_shake, unit_components
 from src.audio import audio_manager
 from src.game_state import game_state
 
@@ -26,13 +26,14 @@ def handle_ball_collisions(balls, dt, beat_intensity=0.5):
     collision_pairs_processed = set()
 
     # Get current time-based parameters from game_state
-    chaos = game_state.chaos_factor # Alias for brevity
-    collision_shrink_factor = game_state.get_current_value(INITIAL_COLLISION_SHRINK_FACTOR, FINAL_COLLISION_SHRINK_FACTOR)
-    ball_elasticity = game_state.get_current_value(INITIAL_BALL_ELASTICITY, FINAL_BALL_ELASTICITY)
-    split_chance = game_state.get_current_value(INITIAL_SPLIT_CHANCE, FINAL_SPLIT_CHANCE)
-    merge_threshold = game_state.get_current_value(INITIAL_COLOR_DISTANCE_THRESHOLD, FINAL_COLOR_DISTANCE_THRESHOLD)
-    split_mass_loss = game_state.get_current_value(INITIAL_SPLIT_MASS_LOSS_FACTOR, FINAL_SPLIT_MASS_LOSS_FACTOR)
-    current_shake_intensity = game_state.get_current_value(INITIAL_SHAKE_INTENSITY, FINAL_SHAKE_INTENSITY)
+    params = game_state.params
+    chaos = params.chaos # Alias for brevity
+    collision_shrink_factor = params.collision_shrink
+    ball_elasticity = params.ball_elasticity
+    split_chance = params.split_chance
+    merge_threshold = params.merge_threshold
+    split_mass_loss = params.split_mass_loss
+    current_shake_intensity = params.shake_intensity
     
     # Apply beat influence
     beat_influence = 0.7 + beat_intensity * 0.6  # Range from 0.7 to 1.3
@@ -51,30 +52,33 @@ def handle_ball_collisions(balls, dt, beat_intensity=0.5):
             ball_a = balls[i]
             ball_b = balls[j]
 
-            vec_dist = ball_a.position - ball_b.position
-            dist_sq = vec_dist.length_squared()
+            # Contact math stays on raw floats; Vector2s are only built for effects and spawns
+            dx = ball_a.px - ball_b.px
+            dy = ball_a.py - ball_b.py
+            dist_sq = dx * dx + dy * dy
             min_dist = ball_a.radius + ball_b.radius
             min_dist_sq = min_dist * min_dist
 
             if dist_sq < min_dist_sq and dist_sq > 1e-9:
                 dist = math.sqrt(dist_sq)
-                normal = vec_dist / dist
+                nx = dx / dist
+                ny = dy / dist
 
                 # 1. Resolve Overlap
                 overlap = min_dist - dist
                 total_mass = ball_a.mass + ball_b.mass
                 if total_mass > 1e-9:
-                    move_a = normal * (overlap * (ball_b.mass / total_mass))
-                    move_b = -normal * (overlap * (ball_a.mass / total_mass))
-                    ball_a.position += move_a
-                    ball_b.position += move_b
+                    move_a = overlap * (ball_b.mass / total_mass)
+                    move_b = overlap * (ball_a.mass / total_mass)
                 else:
-                    ball_a.position += normal * overlap * 0.5
-                    ball_b.position -= normal * overlap * 0.5
+                    move_a = move_b = overlap * 0.5
+                ball_a.px += nx * move_a
+                ball_a.py += ny * move_a
+                ball_b.px -= nx * move_b
+                ball_b.py -= ny * move_b
 
                 # 2. Collision Response
-                relative_velocity = ball_a.velocity - ball_b.velocity
-                vel_along_normal = relative_velocity.dot(normal)
+                vel_along_normal = (ball_a.vx - ball_b.vx) * nx + (ball_a.vy - ball_b.vy) * ny
 
                 if vel_along_normal < 0 :
                     m1 = ball_a.mass if ball_a.mass > 1e-9 else 1e-9
@@ -102,19 +106,25 @@ def handle_ball_collisions(balls, dt, beat_intensity=0.5):
                     ball_a.mass = BASE_DENSITY * ball_a.radius**2
                     ball_b.mass = BASE_DENSITY * ball_b.radius**2
 
-                    impulse_vec = impulse_scalar * normal
-                    ball_a.velocity += impulse_vec * inv_mass1
-                    ball_b.velocity -= impulse_vec * inv_mass2
+                    impulse_a = impulse_scalar * inv_mass1
+                    impulse_b = impulse_scalar * inv_mass2
+                    ball_a.vx += nx * impulse_a
+                    ball_a.vy += ny * impulse_a
+                    ball_b.vx -= nx * impulse_b
+                    ball_b.vy -= ny * impulse_b
 
-                    # Add tangential velocity based on chaos_factor and impact
+                    # Add tangential velocity (along (-ny, nx)) based on chaos_factor and impact
                     if random.random() < 0.15 + chaos * 0.4 + impact_force * 0.2: # Higher chance later & on big hits
-                        tangent = pygame.Vector2(-normal.y, normal.x)
                         spin_factor = 0.05 + chaos * 0.15 # More spin later
-                        ball_a.velocity += tangent * impulse_scalar * inv_mass1 * spin_factor * random.choice([-1, 1])
-                        ball_b.velocity -= tangent * impulse_scalar * inv_mass2 * spin_factor * random.choice([-1, 1])
+                        spin_a = impulse_a * spin_factor * random.choice([-1, 1])
+                        spin_b = impulse_b * spin_factor * random.choice([-1, 1])
+                        ball_a.vx -= ny * spin_a
+                        ball_a.vy += nx * spin_a
+                        ball_b.vx += ny * spin_b
+                        ball_b.vy -= nx * spin_b
 
                     # --- Collision Effects ---
-                    contact_point = ball_b.position + normal * ball_b.radius
+                    contact_point = pygame.Vector2(ball_b.px + nx * ball_b.radius, ball_b.py + ny * ball_b.radius)
                     avg_radius = (ball_a.radius + ball_b.radius) * 0.5
                     try:
                         avg_color = lerp_color(ball_a.current_color, ball_b.current_color, 0.5)
@@ -214,7 +224,7 @@ def handle_ball_collisions(balls, dt, beat_intensity=0.5):
                                     balls_to_remove.add(victim.id)
                                     collision_pairs_processed.add(pair_id)
 
-                                    perp_normal = pygame.Vector2(-normal.y, normal.x) * random.choice([-1, 1])
+                                    perp_normal = pygame.Vector2(-ny, nx) * random.choice([-1, 1])
 
                                     audio_manager.play('collision', (1.0 + chaos * 0.1) * beat_influence, victim.position) # Louder split later
                                     
@@ -255,19 +265,20 @@ def handle_ball_collisions(balls, dt, beat_intensity=0.5):
     return balls_to_add, balls_to_remove
 
 
-def update_game_objects(dt, beat_intensity=0.5):
+def update_game_objects(dt, now, beat_intensity=0.5):
     """
     Update all game objects, applying time-based chaos scaling.
 
     Args:
         dt: Time delta in seconds
+        now: Frame timestamp (time.perf_counter()) shared by every entity this frame
         beat_intensity: Current audio beat intensity (0.0 to 1.0)
     """
     # Limit dt to prevent huge steps that could cause instability
     dt = min(dt, 1.0 / 20.0)  # Cap at 20 FPS equivalent to prevent physics issues
     
-    # Update chaos factor first
-    game_state.update_chaos_factor()
+    # Update chaos factor and this frame's lerped values first
+    params = game_state.begin_frame(now)
 
     new_effects = []
     balls_to_remove_small = set()
@@ -279,7 +290,7 @@ def update_game_objects(dt, beat_intensity=0.5):
         original_freq = ball.pulse_frequency
         ball.pulse_frequency = PULSE_FREQUENCY * random.uniform(0.8, 1.2) * beat_pulse_factor
         
-        update_result = ball.update(dt)
+        update_result = ball.update(dt, params, now)
         
         # Reset frequency to avoid drift
         ball.pulse_frequency = original_freq
@@ -298,7 +309,7 @@ def update_game_objects(dt, beat_intensity=0.5):
             pop_particle_speed = PARTICLE_SPEED_MAX * (1.0 + game_state.chaos_factor) # Faster particles later
             pop_particle_speed *= 1.0 + (beat_intensity - 0.5) * 0.4  # Faster with beat
             
-            pop_shake_intensity = game_state.get_current_value(INITIAL_SHAKE_INTENSITY, FINAL_SHAKE_INTENSITY) * 0.5
+            pop_shake_intensity = params.shake_intensity * 0.5
             pop_shake_intensity *= 1.0 + (beat_intensity - 0.5) * 0.6  # Stronger with beat
 
             game_state.effects.append(
@@ -322,6 +333,10 @@ def update_game_objects(dt, beat_intensity=0.5):
             
             trigger_screen_shake(SHAKE_DURATION * 0.4, pop_shake_intensity)
 
+    # Batched gravity, drag, integration and wall detection for the surviving balls
+    ball_system.step([ball for ball in game_state.balls if ball.id not in balls_to_remove_small], dt, params)
+
+    for ball in game_state.balls:
         if ball.hit_wall_effect_info:
             info = ball.hit_wall_effect_info
             new_effects.append(
@@ -341,9 +356,15 @@ def update_game_objects(dt, beat_intensity=0.5):
         game_state.balls.extend(balls_to_add)
 
     # Update particles and effects
-    game_state.particles = [p for p in game_state.particles if p.update(dt)]
-    game_state.effects.extend(new_effects)
-    game_state.effects = [e for e in game_state.effects if e.update()]
+    game_state.particles.update(dt, now)
+    effects = game_state.effects
+    effects.extend(new_effects)
+    live = 0
+    for effect in effects: # Compact survivors in place instead of building a new list each frame
+        if effect.update(now):
+            effects[live] = effect
+            live += 1
+    del effects[live:]
 
     # Update screen shake
     update_screen_shake(dt)
@@ -357,7 +378,7 @@ def update_game_objects(dt, beat_intensity=0.5):
         game_state.balls = game_state.balls[num_to_remove:]
 
     # Add new balls periodically based on chaos factor
-    current_spawn_rate = game_state.get_current_value(INITIAL_SPAWN_RATE, FINAL_SPAWN_RATE)
+    current_spawn_rate = params.spawn_rate
     
     # Make the spawn rate pulse with the beat
     spawn_rate_beat_modifier = 1.0 + (beat_intensity - 0.5) * 0.6  # Range from 0.7 to 1.3
@@ -376,7 +397,7 @@ def update_screen_shake(dt):
         game_state.screen_shake_timer -= dt
         if game_state.screen_shake_timer > 0:
             # Scale intensity with chaos factor
-            current_shake_intensity = game_state.get_current_value(INITIAL_SHAKE_INTENSITY, FINAL_SHAKE_INTENSITY)
+            current_shake_intensity = game_state.params.shake_intensity
             game_state.current_screen_offset.x = random.uniform(-current_shake_intensity, current_shake_intensity)
             game_state.current_screen_offset.y = random.uniform(-current_shake_intensity, current_shake_intensity)
         else:
@@ -396,9 +417,8 @@ def create_initial_balls():
         vel = pygame.Vector2(math.cos(vel_angle), math.sin(vel_angle)) * vel_mag
         radius = random.uniform(MIN_RADIUS * 1.5, MAX_RADIUS * 0.8)
 
-        from src.utilities import random_bright_color
-        color = random_bright_color()
-        game_state.balls.append(Ball(pos, vel, radius, color))
+        from src.utilities import random_bright_hue
+        game_state.balls.append(make_ball(pos, vel, radius, random_bright_hue()))
 
     # Ensure initial colors are somewhat different
     if len(game_state.balls) > 1:
@@ -408,14 +428,7 @@ def create_initial_balls():
                 retries = 0
                 while color_distance(game_state.balls[i].current_color,
                                     game_state.balls[j].current_color) < initial_merge_threshold and retries < 10:
-                    new_color = random_bright_color(False)
-                    game_state.balls[j].base_color = pygame.Color(new_color)
-                    game_state.balls[j].current_color = pygame.Color(new_color)
-                    try:
-                        game_state.balls[j].hue = new_color.hsva[0]
-                    except ValueError:
-                        game_state.balls[j].hue = random.uniform(0, 360)
-                        game_state.balls[j].current_color.hsva = (game_state.balls[j].hue, 100, 100, 100)
+                    game_state.balls[j].set_hue(random_bright_hue(False))
                     retries += 1
 
 
@@ -426,7 +439,7 @@ def spawn_fresh_ball(sync_to_beat=False):
     Args:
         sync_to_beat: If True, increase the size and velocity to emphasize beat
     """
-    from src.utilities import random_bright_color, generate_analogous_color
+    from src.utilities import random_bright_hue
 
     chaos = game_state.chaos_factor
     beat_intensity = audio_manager.get_beat_intensity() if sync_to_beat else 0.5
@@ -436,7 +449,8 @@ def spawn_fresh_ball(sync_to_beat=False):
     angle = random.uniform(0, 2 * math.pi)
     dist_factor = random.uniform(0.8 - chaos * 0.6, 0.95) # Spawn closer to center later
     dist = CONTAINER_RADIUS * dist_factor
-    pos = CENTER + pygame.Vector2(math.cos(angle), math.sin(angle)) * dist
+    outward = pygame.Vector2(math.cos(angle), math.sin(angle))
+    pos = CENTER + outward * dist
 
     # Velocity: Higher and more random over time
     vel_mag = random.uniform(200 + chaos * 300, 400 + chaos * 400)
@@ -444,11 +458,12 @@ def spawn_fresh_ball(sync_to_beat=False):
         vel_mag *= beat_modifier  # Faster on beat
         
     # Direction: More outward bias initially, more random later
-    base_dir = (pos - CENTER).normalize() if dist > 10 else pygame.Vector2(math.cos(angle), math.sin(angle))
-    random_dir = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
+    # pos - CENTER is outward * dist, so the unit direction is already known without a sqrt
+    base_dir = outward
+    random_dir = pygame.Vector2(unit_components(random.uniform(-1, 1), random.uniform(-1, 1)))
     # Lerp between outward and random based on chaos
     vel_dir = lerp_vector(base_dir, random_dir, chaos * 0.7) # 70% random at peak chaos
-    vel = vel_dir.normalize() * vel_mag
+    vel = pygame.Vector2(unit_components(vel_dir.x, vel_dir.y)) * vel_mag
 
 
     # Size: Generally larger over time
@@ -461,12 +476,12 @@ def spawn_fresh_ball(sync_to_beat=False):
     # Color: More chance of analogous colors later
     if len(game_state.balls) > 0 and random.random() < chaos * 0.6: # 60% chance at peak chaos
         reference_ball = random.choice(game_state.balls)
-        color = generate_analogous_color(reference_ball.current_color,
-                                       random.uniform(10, 30 + chaos * 20)) # Wider angle later
+        angle_offset = random.uniform(10, 30 + chaos * 20) # Wider angle later
+        hue = reference_ball.hue + random.choice([-1, 1]) * angle_offset # Analogous hue
     else:
-        color = random_bright_color()
+        hue = random_bright_hue()
 
-    ball = Ball(pos, vel, radius, color)
+    ball = make_ball(pos, vel, radius, hue)
 
     # Spawn effects scaled by chaos and beat
     particle_count = int(10 + chaos*10)
@@ -477,7 +492,7 @@ def spawn_fresh_ball(sync_to_beat=False):
     if sync_to_beat:
         particle_speed *= beat_modifier
         
-    spawn_particles(game_state.particles, pos, particle_count, color, 50, particle_speed)
+    spawn_particles(game_state.particles, pos, particle_count, ball.current_color, 50, particle_speed)
     
     flash_size = radius * (1.5 + chaos*0.5)
     if sync_to_beat:
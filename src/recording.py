@@ -2,14 +2,72 @@ import os
 import time
 import datetime
 import threading
+import queue
+import subprocess
 import pygame
 import numpy as np
 import cv2
 import pyaudio
 import wave
-from src.config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from src.config import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, VIDEO_QUEUE_SIZE, VIDEO_MAX_WAIT, VIDEO_HW_ENCODERS,
+                        VIDEO_SCALE, VIDEO_FPS, VIDEO_FFMPEG_CODEC, VIDEO_LOSSLESS)
 from src.game_state import game_state
 
+class FFmpegPipeWriter:
+    """cv2.VideoWriter stand-in that streams raw RGB frames into an ffmpeg encoder process"""
+
+    def __init__(self, filename, fps, frame_size, codec_args):
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{frame_size[0]}x{frame_size[1]}', '-r', str(fps),
+            '-i', '-',
+            *codec_args,
+            filename
+        ]
+        try:
+            self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        except OSError as e:
+            print(f"Could not start ffmpeg: {e}")
+            self.process = None
+            return
+            
+        # Bad arguments (e.g. an encoder missing from this ffmpeg build) make ffmpeg exit during startup;
+        # give it a moment so the caller can fall back to another writer
+        try:
+            returncode = self.process.wait(timeout=0.2)
+        except subprocess.TimeoutExpired:
+            return # Still running, waiting for frames
+        print(f"ffmpeg exited on startup with code {returncode}")
+        self.process = None
+
+    def isOpened(self):
+        return self.process is not None
+
+    def write(self, frame):
+        if self.process is None:
+            return # Encoder died earlier; skip the rest of the frames
+        try:
+            self.process.stdin.write(frame.data) # Contiguous buffer, written without a tobytes() copy
+        except OSError as e: # BrokenPipeError included
+            print(f"ffmpeg stopped accepting frames: {e}")
+            self.release()
+
+    def release(self):
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        try:
+            process.stdin.close()
+        except OSError:
+            pass # Pipe already broken, ffmpeg is exiting anyway
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            print("ffmpeg did not finish in time and was stopped")
+
+
 class Recorder:
     """Handles video and audio recording of the simulation"""
     
@@ -17,6 +75,13 @@ class Recorder:
         self.recording = False
         self.video_writer = None
         self.video_filename = ""
+        self.lossless_filename = ""  # Intermediate FFV1 file when VIDEO_LOSSLESS is set
+        self.video_thread = None
+        self.frame_queue = None   # Filled frames waiting for the writer thread
+        self.free_buffers = None  # Preallocated frame buffers ready for reuse
+        self.frame_buffer = None  # Row-major frame in the writer's channel order
+        self.swap_channels = True  # OpenCV writers take BGR, ffmpeg pipes take pygame's RGB as is
+        self.scaled_buffer = None
         
         # Audio recording properties
         self.audio_recording = False
@@ -32,8 +97,10 @@ class Recorder:
             os.makedirs(self.output_dir)
             
         # Recording parameters
-        self.fps = FPS
-        self.frame_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.fps = min(VIDEO_FPS, FPS)
+        self.frame_size = (max(1, int(SCREEN_WIDTH * VIDEO_SCALE)), max(1, int(SCREEN_HEIGHT * VIDEO_SCALE)))
+        self.frame_accum = 0  # Decimation accumulator, a frame is kept each time it reaches FPS
+        self.dropped_frames = 0
         
         # Audio parameters
         self.format = pyaudio.paInt16
@@ -51,6 +118,7 @@ class Recorder:
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.video_filename = os.path.join(self.output_dir, f"simulation_{timestamp}.mp4")
         self.audio_filename = os.path.join(self.output_dir, f"simulation_{timestamp}.wav")
+        self.lossless_filename = os.path.join(self.output_dir, f"simulation_{timestamp}.mkv") if VIDEO_LOSSLESS else ""
         
         # Start video recording
         self._start_video_recording()
@@ -63,14 +131,90 @@ class Recorder:
         print(f"Started recording to {self.video_filename}")
         
     def _start_video_recording(self):
-        """Initialize the video writer"""
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        self.video_writer = cv2.VideoWriter(
-            self.video_filename, 
-            fourcc, 
-            self.fps, 
-            self.frame_size
-        )
+        """
+        Initialize the video writer: lossless ffmpeg pipe if enabled, else hardware H.264,
+        else an ffmpeg H.264 pipe, else OpenCV's software mp4v
+        """
+        self.video_writer = None
+        if self.lossless_filename:
+            writer = FFmpegPipeWriter(self.lossless_filename, self.fps, self.frame_size,
+                                      ('-c:v', 'ffv1', '-threads', '4'))
+            if writer.isOpened():
+                print("Recording lossless FFV1, will transcode to MP4 when done")
+                self.video_writer = writer
+            else:
+                self.lossless_filename = ""
+        if self.video_writer is None:
+            self.video_writer = self._open_hardware_writer()
+        if self.video_writer is None:
+            writer = FFmpegPipeWriter(self.video_filename, self.fps, self.frame_size, VIDEO_FFMPEG_CODEC)
+            if writer.isOpened():
+                self.video_writer = writer
+        self.swap_channels = not isinstance(self.video_writer, FFmpegPipeWriter)
+        if self.video_writer is None:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            self.video_writer = cv2.VideoWriter(
+                self.video_filename, 
+                fourcc, 
+                self.fps, 
+                self.frame_size
+            )
+        
+        # Encoding runs on a writer thread; the game loop only copies pixels into a pooled buffer
+        self.free_buffers = queue.Queue()
+        for _ in range(VIDEO_QUEUE_SIZE):
+            self.free_buffers.put(np.empty((SCREEN_WIDTH, SCREEN_HEIGHT, 3), dtype=np.uint8))
+        self.frame_queue = queue.Queue(maxsize=VIDEO_QUEUE_SIZE)
+        self.frame_buffer = np.empty((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8) # Owned by the writer thread
+        if self.frame_size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            self.scaled_buffer = np.empty((self.frame_size[1], self.frame_size[0], 3), dtype=np.uint8)
+        else:
+            self.scaled_buffer = None
+        self.frame_accum = 0
+        self.dropped_frames = 0
+        self.video_thread = threading.Thread(target=self._write_video)
+        self.video_thread.daemon = True
+        self.video_thread.start()
+        
+    def _open_hardware_writer(self):
+        """Try each GStreamer encoder in VIDEO_HW_ENCODERS, returning the first writer that opens or None"""
+        try:
+            if cv2.CAP_GSTREAMER not in cv2.videoio_registry.getWriterBackends():
+                return None
+        except AttributeError:
+            return None # OpenCV build without the videoio registry
+            
+        for encoder in VIDEO_HW_ENCODERS:
+            pipeline = (f'appsrc ! videoconvert ! {encoder} ! h264parse ! mp4mux ! '
+                        f'filesink location="{self.video_filename}"')
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, self.fps, self.frame_size, True)
+            if writer.isOpened():
+                print(f"Recording with hardware encoder {encoder.split()[0]}")
+                return writer
+            writer.release()
+        return None
+        
+    def _write_video(self):
+        """Video writer thread function, encodes queued frames until it receives None"""
+        while True:
+            buffer = self.frame_queue.get()
+            if buffer is None:
+                break
+            try:
+                # pygame is (x, y) RGB and writers want (y, x): transpose, reversing channels for OpenCV, in one pass
+                frame = buffer.transpose(1, 0, 2)
+                if self.swap_channels:
+                    frame = frame[:, :, ::-1]
+                np.copyto(self.frame_buffer, frame)
+                if self.scaled_buffer is not None:
+                    cv2.resize(self.frame_buffer, self.frame_size, dst=self.scaled_buffer, interpolation=cv2.INTER_AREA)
+                    self.video_writer.write(self.scaled_buffer)
+                else:
+                    self.video_writer.write(self.frame_buffer)
+            except Exception as e:
+                print(f"Error writing video frame: {e}")
+            finally:
+                self.free_buffers.put(buffer)
         
     def _start_audio_recording(self):
         """Start audio recording in a separate thread"""
@@ -114,20 +258,37 @@ class Recorder:
         if not self.recording or self.video_writer is None:
             return
             
-        # Convert Pygame surface to numpy array for OpenCV
-        frame = pygame.surfarray.array3d(surface)
-        frame = np.swapaxes(frame, 0, 1)  # Swap the axes as pygame and OpenCV store pixels differently
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)  # Convert RGB to BGR for OpenCV
+        # Keep self.fps out of every FPS game frames, evenly spaced
+        self.frame_accum += self.fps
+        if self.frame_accum < FPS:
+            return
+        self.frame_accum -= FPS
+            
+        # Waits only when the writer thread is VIDEO_QUEUE_SIZE frames behind
+        try:
+            buffer = self.free_buffers.get(timeout=VIDEO_MAX_WAIT)
+        except queue.Empty:
+            self.dropped_frames += 1
+            return
+        pixels = pygame.surfarray.pixels3d(surface)
+        np.copyto(buffer, pixels)
+        del pixels  # Release the surface lock before drawing resumes
         
-        # Write the frame
-        self.video_writer.write(frame)
+        # Hand the frame to the writer thread
+        self.frame_queue.put(buffer)
         
     def stop_recording(self):
         """Stop recording and save the files"""
         if not self.recording:
             return
             
-        # Stop video recording
+        # Stop video recording, letting the writer thread drain its queue first
+        if self.video_thread:
+            self.frame_queue.put(None)
+            self.video_thread.join()
+            self.video_thread = None
+            if self.dropped_frames:
+                print(f"Dropped {self.dropped_frames} frames while the video writer was behind")
         if self.video_writer is not None:
             self.video_writer.release()
             self.video_writer = None
@@ -149,8 +310,12 @@ class Recorder:
             self.pyaudio.terminate()
             self.pyaudio = None
             
-        # Combine audio and video
-        self._combine_audio_video()
+        # Combine audio and video. The audio only exists as a WAV once recording stops, so it can't be
+        # fed to the encoder during the run; the combine step stream-copies the video, so it is a cheap remux
+        if self.lossless_filename:
+            self._transcode_lossless()
+        else:
+            self._combine_audio_video()
             
         self.recording = False
         game_state.recording = False
@@ -184,7 +349,6 @@ class Recorder:
             output_file = self.video_filename.replace('.mp4', '_with_audio.mp4')
             
             # Use ffmpeg to combine audio and video
-            import subprocess
             cmd = [
                 'ffmpeg',
                 '-i', self.video_filename,
@@ -209,5 +373,30 @@ class Recorder:
             print(f"Error combining audio and video: {e}")
             print(f"The separate video and audio files have been preserved.")
 
+    def _transcode_lossless(self):
+        """Encode the lossless recording (plus audio, if saved) into the final MP4 file"""
+        if not os.path.exists(self.lossless_filename):
+            print("Lossless video file missing, cannot transcode")
+            return
+            
+        has_audio = os.path.exists(self.audio_filename)
+        cmd = ['ffmpeg', '-y', '-i', self.lossless_filename]
+        if has_audio:
+            cmd += ['-i', self.audio_filename, '-c:a', 'aac']
+        cmd += ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', self.video_filename]
+        
+        try:
+            subprocess.run(cmd, check=True)
+            
+            # Remove the intermediate files
+            os.remove(self.lossless_filename)
+            if has_audio:
+                os.remove(self.audio_filename)
+                
+            print(f"Transcoded lossless recording into {self.video_filename}")
+        except Exception as e:
+            print(f"Error transcoding lossless recording: {e}")
+            print(f"The lossless video has been preserved at {self.lossless_filename}")
+
 # Global recorder instance
 recorder = Recorder()
\ No newline at end of file
@@ -2,10 +2,29 @@ import pygame
 import random
 import math
 import time
+import numpy as np
+from functools import lru_cache
 from src.config import *
 
 # --- Color and Visual Utilities ---
 
+def random_bright_hue(use_harmony=True):
+    """
+    Pick a random hue with the same spectrum/harmony weighting as random_bright_color.
+    
+    Args:
+        use_harmony: If True, sometimes select the hue from a harmony group
+    
+    Returns:
+        Hue in degrees (0-360)
+    """
+    if use_harmony and random.random() < COLOR_HARMONY_CHANCE:
+        # Select from one of the harmony groups for more pleasing combinations
+        group = random.choice(COLOR_HARMONY_GROUPS)
+        return random.uniform(group[0], group[1])
+    # Completely random hue across the full spectrum
+    return random.uniform(0, COLOR_SPECTRUM_RANGE)
+
 def random_bright_color(use_harmony=True):
     """
     Generate a random vibrant color with more variety and better spectrum coverage.
@@ -16,13 +35,7 @@ def random_bright_color(use_harmony=True):
     Returns:
         A pygame Color object
     """
-    if use_harmony and random.random() < COLOR_HARMONY_CHANCE:
-        # Select from one of the harmony groups for more pleasing combinations
-        group = random.choice(COLOR_HARMONY_GROUPS)
-        h = random.uniform(group[0], group[1])
-    else:
-        # Completely random hue across the full spectrum
-        h = random.uniform(0, COLOR_SPECTRUM_RANGE)
+    h = random_bright_hue(use_harmony)
     
     # More variance in saturation and value while keeping colors vibrant
     s = random.uniform(COLOR_SATURATION_RANGE[0], COLOR_SATURATION_RANGE[1])
@@ -32,6 +45,45 @@ def random_bright_color(use_harmony=True):
     color.hsva = (h, s, v, 100)
     return color
 
+def hsv_to_rgb_array(h, s, v):
+    """
+    Convert whole arrays of HSV colors at once, same ranges as pygame.Color.hsva
+    
+    Args:
+        h: Hue in degrees (0-360), array or scalar
+        s: Saturation (0-100), array or scalar
+        v: Value (0-100), array or scalar
+    
+    Returns:
+        uint8 array of the broadcast shape plus a trailing (r, g, b) axis
+    """
+    h, s, v = np.broadcast_arrays((np.asarray(h, dtype=np.float64) % 360) / 60.0,
+                                  np.asarray(s, dtype=np.float64) / 100,
+                                  np.asarray(v, dtype=np.float64) / 100)
+    sector = np.floor(h).astype(np.int64) % 6
+    f = h - np.floor(h)
+    p, q, t = v * (1 - s), v * (1 - s * f), v * (1 - s * (1 - f))
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    return np.rint(np.stack([r, g, b], axis=-1) * 255).astype(np.uint8)
+
+def random_bright_rgbs(count, use_harmony=True):
+    """
+    Draw count colors with random_bright_color's distribution, converted in one batch
+    
+    Args:
+        count: Number of colors
+        use_harmony: If True, sometimes select hues from a harmony group
+    
+    Returns:
+        List of [r, g, b] lists
+    """
+    h = [random_bright_hue(use_harmony) for _ in range(count)]
+    s = np.random.uniform(COLOR_SATURATION_RANGE[0], COLOR_SATURATION_RANGE[1], count)
+    v = np.random.uniform(COLOR_VALUE_RANGE[0], COLOR_VALUE_RANGE[1], count)
+    return hsv_to_rgb_array(h, s, v).tolist()
+
 def generate_complementary_color(base_color):
     """
     Generate a color complementary to the base color (opposite on the color wheel)
@@ -131,6 +183,137 @@ def lerp_color(c1, c2, factor):
     factor = max(0.0, min(1.0, factor))
     return c1.lerp(c2, factor)
 
+def unit_components(dx, dy):
+    """
+    Normalize (dx, dy) without branching; the epsilon turns a zero vector into (0, 0)
+    instead of the ValueError Vector2.normalize() raises.
+    
+    Args:
+        dx, dy: Vector components
+    
+    Returns:
+        Tuple (nx, ny) of unit length, or (0, 0) for a zero vector
+    """
+    inv_len = 1.0 / (math.sqrt(dx * dx + dy * dy) + 1e-12)
+    return dx * inv_len, dy * inv_len
+
+def _rasterize_circle(radius, rgba):
+    """Render one cached circle sprite, in the display's pixel format once a display exists"""
+    surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, rgba, (radius, radius), radius)
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha() # Same-format blits skip SDL's per-pixel format conversion
+    return surf
+
+@lru_cache(maxsize=4096)
+def _render_glow_sprite(radius, r, g, b, alpha_bucket):
+    alpha = min(255, (alpha_bucket << 5) + 16) # Bucket midpoint
+    return _rasterize_circle(radius, (r, g, b, alpha))
+
+def get_glow_sprite(radius, rgb, alpha):
+    """
+    Get a cached pre-rendered circle sprite. The returned surface is shared, never draw on it.
+    Keys are quantized (int radius, 5 bits per color channel, 8 alpha buckets) so nearby
+    colors and fade steps share one sprite; the difference is invisible under additive blending.
+    
+    Args:
+        radius: Circle radius in pixels (quantized to int, minimum 1)
+        rgb: (r, g, b) tuple of ints
+        alpha: Alpha value 0-255
+    
+    Returns:
+        A pygame Surface of size (2 * radius, 2 * radius)
+    """
+    return _render_glow_sprite(max(1, int(radius)), rgb[0] & 0xF8, rgb[1] & 0xF8, rgb[2] & 0xF8, int(alpha) >> 5)
+
+@lru_cache(maxsize=2048)
+def _render_haze_sprite(radius, r, g, b, alpha_bucket):
+    return _rasterize_circle(radius, (r, g, b, (alpha_bucket << 4) + 8))
+
+def get_haze_sprite(radius, rgb, alpha):
+    """
+    Get a cached circle sprite for alpha-blended (non-additive) layers. Same keying as
+    get_glow_sprite but with 16 alpha buckets, since plain alpha blending shows coarser steps.
+    
+    Args:
+        radius: Circle radius in pixels (quantized to int, minimum 1)
+        rgb: (r, g, b) tuple of ints
+        alpha: Alpha value 0-255
+    
+    Returns:
+        A shared pygame Surface of size (2 * radius, 2 * radius)
+    """
+    return _render_haze_sprite(max(1, int(radius)), rgb[0] & 0xF8, rgb[1] & 0xF8, rgb[2] & 0xF8, int(alpha) >> 4)
+
+@lru_cache(maxsize=2048)
+def _render_disc_sprite(radius, r, g, b):
+    return _rasterize_circle(radius, (r, g, b, 255))
+
+def get_disc_sprite(radius, rgb):
+    """
+    Get a cached fully opaque circle sprite (quantized like get_glow_sprite), used for ball cores
+    so drawing a ball never rasterizes a circle once its sizes and colors are warm in the cache.
+    
+    Args:
+        radius: Circle radius in pixels (quantized to int, minimum 1)
+        rgb: (r, g, b) tuple of ints
+    
+    Returns:
+        A shared pygame Surface of size (2 * radius, 2 * radius)
+    """
+    return _render_disc_sprite(max(1, int(radius)), rgb[0] & 0xF8, rgb[1] & 0xF8, rgb[2] & 0xF8)
+
+@lru_cache(maxsize=1024)
+def _glow_sprite_fades(radius, r, g, b):
+    return tuple(_render_glow_sprite(radius, r, g, b, bucket) for bucket in range(8))
+
+def get_glow_sprite_fades(radius, rgb):
+    """
+    Get all 8 alpha-bucket sprites for one radius/color, so a fading entity can
+    resolve its sprites once and index them with alpha >> 5 while it draws.
+    
+    Args:
+        radius: Circle radius in pixels (quantized to int, minimum 1)
+        rgb: (r, g, b) tuple of ints
+    
+    Returns:
+        Tuple of 8 shared pygame Surfaces, one per alpha bucket
+    """
+    return _glow_sprite_fades(max(1, int(radius)), rgb[0] & 0xF8, rgb[1] & 0xF8, rgb[2] & 0xF8)
+
+class DrawQueue:
+    """
+    Collects (surface, dest) blits so a whole layer goes out in one batched call per blend mode.
+    Queued surfaces must stay valid until flush, so use cached sprites, not scratch surfaces.
+    """
+
+    _HAS_FBLITS = hasattr(pygame.Surface, 'fblits') # pygame-ce only
+
+    def __init__(self):
+        self.additive_seq = []
+        self.alpha_seq = []
+
+    def flush(self, surface):
+        """Blit everything queued onto surface (additive first, then alpha blended) and empty the queue"""
+        self.flush_additive(surface)
+        self.flush_alpha(surface)
+
+    def flush_additive(self, surface):
+        if self.additive_seq:
+            if self._HAS_FBLITS:
+                surface.fblits(self.additive_seq, pygame.BLEND_RGBA_ADD)
+            else:
+                surface.blits([(surf, dest, None, pygame.BLEND_RGBA_ADD) for surf, dest in self.additive_seq], doreturn=False)
+            self.additive_seq.clear()
+
+    def flush_alpha(self, surface):
+        if self.alpha_seq:
+            if self._HAS_FBLITS:
+                surface.fblits(self.alpha_seq, 0)
+            else:
+                surface.blits(self.alpha_seq, doreturn=False)
+            self.alpha_seq.clear()
+
 # --- Effects & Particles ---
 
 def spawn_particles(particles, pos, count, base_color, speed_min, speed_max, lifespan_mod=1.0):
@@ -138,32 +321,34 @@ def spawn_particles(particles, pos, count, base_color, speed_min, speed_max, lif
     Spawn particle effects at a position
     
     Args:
-        particles: List to add particles to
+        particles: ParticlePool to emit into
         pos: Position to spawn particles
         count: Number of particles to spawn
         base_color: Base color for particles
         speed_min/max: Min/max particle speed
         lifespan_mod: Modifier for particle lifespan
     """
-    for _ in range(count):
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(speed_min, speed_max)
-        velocity = pygame.Vector2(math.cos(angle), math.sin(angle)) * speed
-        try:
-            # Particle color variation
-            h, s, v, a = base_color.hsva # Assuming base_color is valid
-            part_h = (h + random.uniform(-20, 20)) % 360
-            part_s = max(0, min(100, s * random.uniform(0.8, 1.2)))
-            part_v = max(0, min(100, v * random.uniform(0.8, 1.2)))
-            part_color = pygame.Color(0)
-            part_color.hsva = (part_h, part_s, part_v, 100) # Alpha 100
-            lifespan = PARTICLE_LIFESPAN * random.uniform(0.7, 1.3) * lifespan_mod
-            part_radius = max(1, PARTICLE_RADIUS * random.uniform(0.8, 1.2)) # Ensure valid radius
-            from src.entities import Particle  # Import here to avoid circular imports
-            particles.append(Particle(pos, velocity, part_color, lifespan, part_radius))
-        except ValueError:
-            # Handle case where base_color might be invalid for HSVA
-            continue
+    if count <= 0:
+        return
+    try:
+        h, s, v, a = base_color.hsva # Assuming base_color is valid
+    except ValueError:
+        # Handle case where base_color might be invalid for HSVA
+        return
+        
+    # Draw every random value for the burst in one NumPy call per quantity
+    angle = np.random.uniform(0, 2 * math.pi, count)
+    speed = np.random.uniform(speed_min, speed_max, count)
+    part_h = (h + np.random.uniform(-20, 20, count)) % 360 # Particle color variation
+    part_s = np.clip(s * np.random.uniform(0.8, 1.2, count), 0, 100)
+    part_v = np.clip(v * np.random.uniform(0.8, 1.2, count), 0, 100)
+    lifespan = PARTICLE_LIFESPAN * np.random.uniform(0.7, 1.3, count) * lifespan_mod
+    part_radius = np.maximum(1, PARTICLE_RADIUS * np.random.uniform(0.8, 1.2, count)) # Ensure valid radius
+    colors = hsv_to_rgb_array(part_h, part_s, part_v).tolist()
+    
+    from src.game_state import game_state
+    particles.emit_many(pos[0], pos[1], np.cos(angle) * speed, np.sin(angle) * speed,
+                        colors, lifespan, part_radius, game_state.frame_time)
 
 def trigger_screen_shake(duration=SHAKE_DURATION, intensity=FINAL_SHAKE_INTENSITY):
     """